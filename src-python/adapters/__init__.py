@@ -162,6 +162,19 @@ def clear_adapter_cache():
     _adapter_instances.clear()
 
 
+async def close_adapters():
+    """
+    关闭所有已创建的适配器实例（应用关闭时调用）
+    
+    单个适配器关闭失败不影响其余适配器。
+    """
+    for name, adapter in list(_adapter_instances.items()):
+        try:
+            await adapter.close()
+        except Exception as e:
+            print(f"关闭适配器 {name} 失败: {e}", flush=True)
+
+
 # 导出
 __all__ = [
     "BaseAdapter",
@@ -174,4 +187,5 @@ __all__ = [
     "get_adapter_names",
     "register_adapter",
     "clear_adapter_cache",
+    "close_adapters",
 ]
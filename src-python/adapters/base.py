@@ -6,6 +6,10 @@
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Dict, List, Optional
 import importlib
+import io
+import os
+import re
+import sys
 from pydantic import BaseModel, Field
 
 
@@ -61,6 +65,52 @@ def get_missing_tools_message(missing: List[str]) -> str:
     )
 
 
+# ============== 路径清理 ==============
+
+_QUOTED = re.compile(r'^[\s"\']*(.*?)[\s"\']*$', re.DOTALL).match
+
+
+def strip_quotes(value: str) -> str:
+    """
+    去除首尾空白和引号（只处理两端，保留中间的引号）
+    
+    一次预编译正则匹配完成，替代逐个路径的 strip().strip('"\'')
+    """
+    return _QUOTED(value).group(1)
+
+
+# ============== 输出编码 ==============
+
+def ensure_utf8_output() -> None:
+    """
+    确保 stdout/stderr 使用 UTF-8 编码，避免 Windows GBK 编码问题
+    
+    由需要输出中文的适配器在 __init__ 中调用，纯导入不产生副作用。
+    优先原地 reconfigure，不支持时再重新包装；已是 UTF-8 的流不做处理，可重复调用。
+    """
+    if sys.platform != 'win32':
+        return
+    
+    # 设置环境变量，子进程同样使用 UTF-8
+    os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
+    
+    for name in ('stdout', 'stderr'):
+        stream = getattr(sys, name)
+        encoding = (getattr(stream, 'encoding', None) or '').lower().replace('-', '')
+        if stream is None or encoding == 'utf8':
+            continue
+        try:
+            stream.reconfigure(encoding='utf-8', errors='replace', line_buffering=True)
+        except (AttributeError, ValueError, OSError):
+            if hasattr(stream, 'buffer'):
+                setattr(sys, name, io.TextIOWrapper(
+                    stream.buffer,
+                    encoding='utf-8',
+                    errors='replace',
+                    line_buffering=True
+                ))
+
+
 # 已知的工具包映射（适配器名称 -> 包名）
 TOOL_PACKAGE_MAP = {
     "repacku": "repacku",
@@ -195,6 +245,14 @@ class BaseAdapter(ABC):
         """
         pass
     
+    async def close(self) -> None:
+        """
+        释放适配器持有的资源
+        
+        应用关闭时调用，默认无操作；需要在退出前保存状态的适配器可覆盖此方法。
+        """
+        pass
+    
     def get_schema(self) -> Dict:
         """
         获取输入参数 Schema（用于前端生成表单）
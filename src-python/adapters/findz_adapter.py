@@ -8,9 +8,7 @@ findz 适配器
 3. archives_only: 只搜索压缩包本身
 """
 
-import io
 import os
-import sys
 import traceback
 from datetime import datetime
 from pathlib import Path
@@ -18,30 +16,7 @@ from typing import Callable, Dict, List, Optional, Any
 
 from pydantic import Field
 
-from .base import BaseAdapter, AdapterInput, AdapterOutput
-
-
-def _ensure_utf8_output():
-    """确保 stdout/stderr 使用 UTF-8 编码"""
-    if sys.platform == 'win32':
-        os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
-        if hasattr(sys.stdout, 'buffer'):
-            sys.stdout = io.TextIOWrapper(
-                sys.stdout.buffer, 
-                encoding='utf-8', 
-                errors='replace',
-                line_buffering=True
-            )
-        if hasattr(sys.stderr, 'buffer'):
-            sys.stderr = io.TextIOWrapper(
-                sys.stderr.buffer, 
-                encoding='utf-8', 
-                errors='replace',
-                line_buffering=True
-            )
-
-
-_ensure_utf8_output()
+from .base import BaseAdapter, AdapterInput, AdapterOutput, ensure_utf8_output
 
 
 class FindzInput(AdapterInput):
@@ -90,6 +65,10 @@ class FindzAdapter(BaseAdapter):
     input_schema = FindzInput
     output_schema = FindzOutput
     
+    def __init__(self):
+        super().__init__()
+        ensure_utf8_output()
+    
     def _import_module(self) -> Dict:
         """懒加载导入 findz 模块"""
         from findz.filter.filter import create_filter
@@ -8,37 +8,14 @@ formatv 适配器
 3. check_duplicates: 检查带前缀文件对应的无前缀重复文件
 """
 
-import io
+import asyncio
 import os
-import sys
+from collections import Counter, defaultdict
 from typing import Callable, Dict, List, Optional
 
 from pydantic import Field
 
-from .base import BaseAdapter, AdapterInput, AdapterOutput
-
-
-def _ensure_utf8_output():
-    """确保 stdout/stderr 使用 UTF-8 编码"""
-    if sys.platform == 'win32':
-        os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
-        if hasattr(sys.stdout, 'buffer'):
-            sys.stdout = io.TextIOWrapper(
-                sys.stdout.buffer, 
-                encoding='utf-8', 
-                errors='replace',
-                line_buffering=True
-            )
-        if hasattr(sys.stderr, 'buffer'):
-            sys.stderr = io.TextIOWrapper(
-                sys.stderr.buffer, 
-                encoding='utf-8', 
-                errors='replace',
-                line_buffering=True
-            )
-
-
-_ensure_utf8_output()
+from .base import BaseAdapter, AdapterInput, AdapterOutput, ensure_utf8_output
 
 
 class FormatVInput(AdapterInput):
@@ -48,6 +25,7 @@ class FormatVInput(AdapterInput):
     action: str = Field(default="scan", description="操作类型: scan/add_nov/remove_nov/check_duplicates")
     recursive: bool = Field(default=False, description="是否递归扫描子目录")
     prefix_name: str = Field(default="hb", description="检查重复时使用的前缀名称")
+    minimal_data: bool = Field(default=False, description="扫描结果的 data 中只返回计数，不重复携带文件列表")
 
 
 class FormatVOutput(AdapterOutput):
@@ -80,6 +58,13 @@ class FormatVAdapter(BaseAdapter):
     input_schema = FormatVInput
     output_schema = FormatVOutput
     
+    # 懒加载的前缀配置缓存
+    _prefixes: Optional[List[Dict]] = None
+    
+    def __init__(self):
+        super().__init__()
+        ensure_utf8_output()
+    
     def _import_module(self) -> Dict:
         """懒加载导入 formatv 模块"""
         from formatv.scan import scan_directories, find_video_files
@@ -100,6 +85,21 @@ class FormatVAdapter(BaseAdapter):
             'get_default_path': get_default_path,
         }
     
+    def get_prefixes(self) -> List[Dict]:
+        """
+        获取前缀配置（带缓存）
+        
+        Returns:
+            前缀配置列表
+        """
+        if self._prefixes is None:
+            self._prefixes = self.get_module()['get_prefix_list']()
+        return self._prefixes
+    
+    def invalidate_prefixes(self):
+        """清除前缀配置缓存，下次使用时重新读取"""
+        self._prefixes = None
+    
     async def execute(
         self,
         input_data: FormatVInput,
@@ -120,21 +120,19 @@ class FormatVAdapter(BaseAdapter):
         else:
             return FormatVOutput(success=False, message=f"未知操作: {action}")
     
-    def _collect_paths(self, input_data: FormatVInput) -> List[str]:
-        """收集并验证路径"""
+    async def _collect_paths(self, input_data: FormatVInput) -> List[str]:
+        """收集并验证路径（并发检查存在性，远程路径不再逐个串行等待）"""
         paths = list(input_data.paths) if input_data.paths else []
         if input_data.path:
             path = input_data.path.strip().strip('"')
             if path and path not in paths:
                 paths.append(path)
         # 去除引号并验证存在
-        from pathlib import Path
-        valid_paths = []
-        for p in paths:
-            p = p.strip().strip('"')
-            if Path(p).exists():
-                valid_paths.append(p)
-        return valid_paths
+        candidates = [p.strip().strip('"') for p in paths]
+        exists = await asyncio.gather(
+            *(asyncio.to_thread(os.path.exists, p) for p in candidates)
+        )
+        return [p for p, ok in zip(candidates, exists) if ok]
     
     async def _scan(
         self,
@@ -143,14 +141,13 @@ class FormatVAdapter(BaseAdapter):
         on_log: Optional[Callable[[str], None]] = None
     ) -> FormatVOutput:
         """扫描目录"""
-        paths = self._collect_paths(input_data)
+        paths = await self._collect_paths(input_data)
         if not paths:
             return FormatVOutput(success=False, message="未指定有效路径")
         
         try:
-            module = self._import_module()
+            module = self.get_module()
             find_video_files = module['find_video_files']
-            get_prefix_list = module['get_prefix_list']
             
             if on_log:
                 on_log(f"开始扫描 {len(paths)} 个目录...")
@@ -160,17 +157,14 @@ class FormatVAdapter(BaseAdapter):
             # 合并扫描结果
             total_normal = 0
             total_nov = 0
-            prefixed_counts: Dict[str, int] = {}
             all_normal_files: List[str] = []
             all_nov_files: List[str] = []
-            all_prefixed_files: Dict[str, List[str]] = {}
             
-            # 初始化前缀计数
-            prefixes = get_prefix_list()
-            for p in prefixes:
-                name = p.get("name", "")
-                prefixed_counts[name] = 0
-                all_prefixed_files[name] = []
+            # 初始化前缀计数（Counter/defaultdict 省去循环内的 get/in 探测）
+            prefixes = self.get_prefixes()
+            prefix_names = [p.get("name", "") for p in prefixes]
+            prefixed_counts: Dict[str, int] = Counter(dict.fromkeys(prefix_names, 0))
+            all_prefixed_files: Dict[str, List[str]] = defaultdict(list, {name: [] for name in prefix_names})
             
             for i, path in enumerate(paths):
                 if on_progress:
@@ -187,14 +181,15 @@ class FormatVAdapter(BaseAdapter):
                 all_nov_files.extend(nov_files)
                 
                 for name, files in result.get("prefixed_files", {}).items():
-                    prefixed_counts[name] = prefixed_counts.get(name, 0) + len(files)
-                    if name not in all_prefixed_files:
-                        all_prefixed_files[name] = []
+                    prefixed_counts[name] += len(files)
                     all_prefixed_files[name].extend(files)
                 
                 if on_log:
                     on_log(f"✓ {path}: {len(normal_files)} 普通, {len(nov_files)} .nov")
             
+            prefixed_counts = dict(prefixed_counts)
+            all_prefixed_files = dict(all_prefixed_files)
+            
             if on_progress:
                 on_progress(100, "扫描完成")
             
@@ -214,7 +209,21 @@ class FormatVAdapter(BaseAdapter):
                 for p in prefixes
             ]
             
-            return FormatVOutput(
+            data = {
+                'normal_count': total_normal,
+                'nov_count': total_nov,
+                'prefixed_counts': prefixed_counts,
+                'paths': paths,
+                'prefixes': prefix_configs
+            }
+            if not input_data.minimal_data:
+                # 与模型字段共享同一列表引用，不额外复制
+                data['normal_files'] = all_normal_files
+                data['nov_files'] = all_nov_files
+                data['prefixed_files'] = all_prefixed_files
+            
+            # 列表均由本方法构建，跳过逐元素校验直接构造
+            return FormatVOutput.model_construct(
                 success=True,
                 message=f"扫描完成: {total_normal} 普通, {total_nov} .nov",
                 normal_count=total_normal,
@@ -223,16 +232,7 @@ class FormatVAdapter(BaseAdapter):
                 normal_files=all_normal_files,
                 nov_files=all_nov_files,
                 prefixed_files=all_prefixed_files,
-                data={
-                    'normal_count': total_normal,
-                    'nov_count': total_nov,
-                    'prefixed_counts': prefixed_counts,
-                    'normal_files': all_normal_files,
-                    'nov_files': all_nov_files,
-                    'prefixed_files': all_prefixed_files,
-                    'paths': paths,
-                    'prefixes': prefix_configs
-                }
+                data=data
             )
             
         except ImportError as e:
@@ -249,12 +249,12 @@ class FormatVAdapter(BaseAdapter):
         on_log: Optional[Callable[[str], None]] = None
     ) -> FormatVOutput:
         """添加 .nov 后缀"""
-        paths = self._collect_paths(input_data)
+        paths = await self._collect_paths(input_data)
         if not paths:
             return FormatVOutput(success=False, message="未指定有效路径")
         
         try:
-            module = self._import_module()
+            module = self.get_module()
             find_video_files = module['find_video_files']
             add_nov_extension_to_files = module['add_nov_extension_to_files']
             
@@ -315,12 +315,12 @@ class FormatVAdapter(BaseAdapter):
         on_log: Optional[Callable[[str], None]] = None
     ) -> FormatVOutput:
         """移除 .nov 后缀"""
-        paths = self._collect_paths(input_data)
+        paths = await self._collect_paths(input_data)
         if not paths:
             return FormatVOutput(success=False, message="未指定有效路径")
         
         try:
-            module = self._import_module()
+            module = self.get_module()
             find_video_files = module['find_video_files']
             remove_nov_extension_from_files = module['remove_nov_extension_from_files']
             
@@ -381,15 +381,14 @@ class FormatVAdapter(BaseAdapter):
         on_log: Optional[Callable[[str], None]] = None
     ) -> FormatVOutput:
         """检查重复项"""
-        paths = self._collect_paths(input_data)
+        paths = await self._collect_paths(input_data)
         if not paths:
             return FormatVOutput(success=False, message="未指定有效路径")
         
         try:
-            module = self._import_module()
+            module = self.get_module()
             find_video_files = module['find_video_files']
             check_and_save_duplicates = module['check_and_save_duplicates']
-            get_prefix_list = module['get_prefix_list']
             
             prefix_name = input_data.prefix_name or "hb"
             
@@ -406,7 +405,7 @@ class FormatVAdapter(BaseAdapter):
             }
             
             # 初始化前缀
-            prefixes = get_prefix_list()
+            prefixes = self.get_prefixes()
             for p in prefixes:
                 merged_results["prefixed_files"][p.get("name", "")] = []
             
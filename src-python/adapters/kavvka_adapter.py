@@ -5,15 +5,36 @@ Czkawka 辅助工具 - 处理图片文件夹并生成路径
 直接调用 kavvka 源码包的核心函数
 """
 
+import os
+import stat
 import sys
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional
 
 from pydantic import BaseModel, Field
 
 from .base import BaseAdapter, AdapterOutput
 
 
+def _fast_scandir(path) -> Iterator[os.DirEntry]:
+    """
+    批量枚举目录项
+    
+    os.scandir 在 Windows 上使用 FindFirstFileExW 大缓冲区批量读取，
+    在 Linux 上使用 getdents 的 d_type；调用方先按名称过滤，再对剩下的项调用 _entry_is_dir。
+    """
+    with os.scandir(path) as it:
+        yield from it
+
+
+def _entry_is_dir(entry: os.DirEntry) -> bool:
+    """目录项是否为目录（跟随符号链接），无法访问时视为否"""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
 class KavvkaInput(BaseModel):
     """kavvka 输入参数"""
     action: str = Field(default="process", description="操作类型: process, scan")
@@ -126,12 +147,15 @@ class KavvkaAdapter(BaseAdapter):
             if on_progress:
                 on_progress(int((i / total) * 100), f"处理 {path.name}")
             
-            if not path.exists():
+            # 单次 stat 同时判断存在性和目录类型
+            try:
+                is_dir = stat.S_ISDIR(path.stat().st_mode)
+            except OSError:
                 if on_log:
                     on_log(f"❌ 路径不存在: {path}")
                 continue
             
-            if not path.is_dir():
+            if not is_dir:
                 if on_log:
                     on_log(f"❌ 不是目录: {path}")
                 continue
@@ -147,13 +171,18 @@ class KavvkaAdapter(BaseAdapter):
                 on_log(f"📂 比较文件夹: {compare_folder}")
             
             # 获取同级文件夹（排除自身、#compare、画师文件夹）
-            siblings = []
-            for entry in path.parent.iterdir():
-                if (entry.is_dir() and 
-                    entry.resolve() != path.resolve() and 
-                    entry.name != "#compare" and 
-                    not ('[' in entry.name and ']' in entry.name)):
-                    siblings.append(entry)
+            # 先按名称过滤，只对剩下的项查询目录类型（取自 scandir 的目录项缓存），
+            # 最后按解析后的路径排除自身（自身或指向自身的符号链接）
+            self_resolved = path.resolve()
+            parent = path.parent
+            siblings = [
+                parent / entry.name
+                for entry in _fast_scandir(parent)
+                if entry.name != "#compare"
+                and not ('[' in entry.name and ']' in entry.name)
+                and _entry_is_dir(entry)
+                and Path(entry.path).resolve() != self_resolved
+            ]
             
             # 移动同级文件夹
             moved = []
@@ -189,7 +218,8 @@ class KavvkaAdapter(BaseAdapter):
         if on_progress:
             on_progress(100, "处理完成")
         
-        return KavvkaOutput(
+        # 结果列表均由本方法构建，跳过逐元素校验直接构造
+        return KavvkaOutput.model_construct(
             success=success_count > 0,
             message=f"处理完成，成功 {success_count}/{total}",
             all_combined_paths=all_combined_paths,
@@ -231,7 +261,7 @@ class KavvkaAdapter(BaseAdapter):
             if on_progress:
                 on_progress(int((i / total) * 50), f"扫描 {root_path.name}")
             
-            if not root_path.exists() or not root_path.is_dir():
+            if not root_path.is_dir():
                 if on_log:
                     on_log(f"❌ 路径无效: {path_str}")
                 continue
@@ -258,7 +288,7 @@ class KavvkaAdapter(BaseAdapter):
         if on_log:
             on_log(f"✅ 找到 {len(matched_paths)} 个匹配文件夹")
         
-        return KavvkaOutput(
+        return KavvkaOutput.model_construct(
             success=len(matched_paths) > 0,
             message=f"扫描完成，找到 {len(matched_paths)} 个匹配文件夹",
             all_combined_paths=matched_paths,
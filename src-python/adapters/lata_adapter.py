@@ -9,14 +9,62 @@ Taskfile 任务启动器 - 使用 lata 包进行交互式任务选择和执行
 - 支持任务参数输入
 """
 
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
 
 from pydantic import BaseModel, Field
 
 from .base import BaseAdapter, AdapterOutput
 
 
+class _TaskEntry(NamedTuple):
+    """前端任务列表中的单个任务"""
+    name: str
+    desc: str
+    prompt: Optional[str]
+    cmds: Any
+    cmd_count: int
+    silent: bool
+    vars: Dict
+    deps: List
+    sources: List
+    generates: List
+
+
+def _task_entry(name: str, info: Dict) -> _TaskEntry:
+    """解析单个任务定义"""
+    # 解析命令列表
+    cmds = info.get('cmds', [])
+    return _TaskEntry(
+        name,
+        info.get('desc', ''),
+        info.get('prompt'),
+        cmds,
+        len(cmds) if isinstance(cmds, list) else 0,
+        info.get('silent', False),
+        info.get('vars', {}),
+        info.get('deps', []),
+        info.get('sources', []),
+        info.get('generates', []),
+    )
+
+
+def _build_task_list(task_defs: Dict) -> List[Dict]:
+    """将 Taskfile 的 tasks 定义解析为前端使用的任务列表（跳过 default）"""
+    return [
+        _task_entry(name, info)._asdict()
+        for name, info in task_defs.items() if name != 'default'
+    ]
+
+
+@lru_cache(maxsize=64)
+def _load_launcher(launcher_class, path_str: str, mtime_ns: int, size: int):
+    """加载并缓存 TaskfileLauncher（键包含 mtime/size，文件变更后自动失效）"""
+    return launcher_class(Path(path_str))
+
+
 class LataInput(BaseModel):
     """lata 输入参数"""
     action: str = Field(default="list", description="操作类型: list/execute")
@@ -47,6 +95,11 @@ class LataAdapter(BaseAdapter):
     input_schema = LataInput
     output_schema = LataOutput
     
+    @staticmethod
+    def clear_cache():
+        """清除 Taskfile 解析缓存"""
+        _load_launcher.cache_clear()
+    
     def _import_module(self) -> Dict:
         """懒加载导入 lata 模块"""
         from lata import get_launcher
@@ -67,19 +120,33 @@ class LataAdapter(BaseAdapter):
         
         # 解析 Taskfile 路径，清理引号
         taskfile_path = None
+        taskfile_stat = None
         if input_data.taskfile_path:
             # 去除首尾引号和空白
             clean_path = input_data.taskfile_path.strip().strip('"\'')
             taskfile_path = Path(clean_path)
-            # 检查文件是否存在
-            if not taskfile_path.exists():
+            # 检查文件是否存在（stat 结果同时用作缓存键）
+            try:
+                taskfile_stat = os.stat(taskfile_path)
+            except OSError:
                 return LataOutput(
                     success=False,
                     message=f"Taskfile 不存在: {taskfile_path}"
                 )
         
+        launcher = None
         try:
-            launcher = TaskfileLauncher(taskfile_path)
+            if taskfile_stat is not None:
+                cache_key = (
+                    TaskfileLauncher,
+                    str(taskfile_path.resolve()),
+                    taskfile_stat.st_mtime_ns,
+                    taskfile_stat.st_size
+                )
+                launcher = _load_launcher(*cache_key)
+            else:
+                # 未指定路径时由 lata 自行查找 Taskfile，不做缓存
+                launcher = TaskfileLauncher(taskfile_path)
         except SystemExit:
             # lata 在加载失败时会调用 sys.exit(1)
             return LataOutput(
@@ -93,27 +160,8 @@ class LataAdapter(BaseAdapter):
             )
         
         if input_data.action == "list":
-            # 列出所有任务，解析完整信息
-            tasks = []
-            for name, info in launcher.tasks.items():
-                if name != 'default':
-                    # 解析命令列表
-                    cmds = info.get('cmds', [])
-                    cmd_count = len(cmds) if isinstance(cmds, list) else 0
-                    
-                    tasks.append({
-                        'name': name,
-                        'desc': info.get('desc', ''),
-                        'prompt': info.get('prompt', None),
-                        'cmds': cmds,
-                        'cmd_count': cmd_count,
-                        'silent': info.get('silent', False),
-                        'vars': info.get('vars', {}),
-                        'deps': info.get('deps', []),
-                        'sources': info.get('sources', []),
-                        'generates': info.get('generates', []),
-                    })
-            
+            # 列出所有任务，从缓存的 launcher 解析完整信息（每次新建列表，调用方可自由修改）
+            tasks = _build_task_list(launcher.tasks)
             if on_log:
                 on_log(f"找到 {len(tasks)} 个任务")
             
@@ -3,19 +3,45 @@ marku 适配器
 Markdown 模块化处理工具箱 - 支持直接文本输入/输出和 Diff 对比
 """
 
+import asyncio
 import difflib
+import itertools
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
 from pydantic import BaseModel, Field
 
-from .base import BaseAdapter, AdapterOutput
+from .base import BaseAdapter, AdapterOutput, strip_quotes
+
+
+@lru_cache(maxsize=1024)
+def _path(path_str: str) -> Path:
+    """缓存 Path 对象，反复处理相同路径时免去重复解析（Path 不可变，可安全共享）"""
+    return Path(path_str)
+
+
+class _PendingUndo:
+    """批次模式下尚未保存的撤销点"""
+    
+    def __init__(self, manager, started: float):
+        self.manager = manager
+        self.started = started
+        # 批次内运行过的模块（有序去重）
+        self.modules: Dict[str, None] = {}
+
+
+# (batch_id, root) -> 待保存的撤销点
+_pending_undo: Dict[Tuple[str, str], _PendingUndo] = {}
 
 
 class MarkuInput(BaseModel):
     """marku 输入参数"""
-    action: str = Field(default="run", description="操作类型: run, undo, history, text")
+    action: str = Field(default="run", description="操作类型: run, undo, history, text, commit_batch")
     module: str = Field(default="markt", description="处理模块名")
     paths: List[str] = Field(default_factory=list, description="要处理的路径列表")
     input_text: Optional[str] = Field(default=None, description="直接输入的 Markdown 文本")
@@ -23,6 +49,8 @@ class MarkuInput(BaseModel):
     recursive: bool = Field(default=False, description="是否递归处理")
     dry_run: bool = Field(default=True, description="预览模式")
     enable_undo: bool = Field(default=True, description="启用 Git 撤销")
+    batch_id: Optional[str] = Field(default=None, description="批次 ID，设置后推迟保存撤销点，直到 commit_batch")
+    include_diff: bool = Field(default=True, description="文本模式下生成 diff_text，批量处理时可关闭以省去 difflib 开销")
 
 
 class MarkuOutput(AdapterOutput):
@@ -33,6 +61,7 @@ class MarkuOutput(AdapterOutput):
     output_text: Optional[str] = Field(default=None, description="处理后的文本")
     diff_text: Optional[str] = Field(default=None, description="Unified Diff 文本")
     diffs: List[Dict[str, Any]] = Field(default_factory=list, description="文件 Diff 列表")
+    diffs_truncated: bool = Field(default=False, description="diffs 是否因条目上限被截断")
     undo_sha: Optional[str] = Field(default=None, description="撤销提交 SHA")
 
 
@@ -48,6 +77,37 @@ class MarkuAdapter(BaseAdapter):
     input_schema = MarkuInput
     output_schema = MarkuOutput
     
+    # 文件模式下达到该路径数才启用并行处理，路径较少时线程池开销得不偿失
+    PARALLEL_MIN_PATHS = 8
+    # 并行处理的最大线程数
+    MAX_PARALLEL_WORKERS = 32
+    
+    # 文件模式返回的 diff 行数上限：单个文件与全部文件合计
+    MAX_FILE_DIFF_ENTRIES = 100
+    MAX_TOTAL_DIFF_ENTRIES = 10_000
+    
+    # 批次撤销点的最长等待时间（秒），超时后自动提交
+    BATCH_UNDO_TIMEOUT = 300
+    
+    # action -> 处理方法名；未列出的操作直接返回错误
+    _ACTIONS = {
+        "undo": "_undo",
+        "history": "_history",
+        "commit_batch": "_commit_batch",
+        "run": "_run",
+        "text": "_run",
+    }
+    
+    def __init__(self):
+        super().__init__()
+        # 文本模式的临时目录，首次使用时创建，实例回收或进程退出时清理
+        self._tmpdir: Optional[tempfile.TemporaryDirectory] = None
+        self._buffer_lock = threading.Lock()
+        # 已解析的 marku 接口元组，见 _marku_api
+        self._api: Optional[Tuple] = None
+        # 批次到期后在后台运行的保存任务（保留引用，避免任务被回收）
+        self._flush_tasks: set = set()
+    
     def _import_module(self) -> Dict:
         """懒加载导入 marku 模块"""
         from marku.core.base import ModuleContext
@@ -63,12 +123,200 @@ class MarkuAdapter(BaseAdapter):
             "GitUndoManager": GitUndoManager,
         }
     
-    def _generate_unified_diff(self, original: str, processed: str, filename: str = "input.md") -> str:
-        """生成 Unified Diff 格式的差异"""
+    def _generate_unified_diff(self, original: str, processed: str, filename: str = "input.md") -> Optional[str]:
+        """生成 Unified Diff 格式的差异，内容相同时返回 None"""
+        if len(original) == len(processed) and original == processed:
+            return None
+        # 保留行尾，仅换行符不同（如 CRLF -> LF）时也能生成差异
         orig_lines = original.splitlines(keepends=True)
         proc_lines = processed.splitlines(keepends=True)
         diff = difflib.unified_diff(orig_lines, proc_lines, fromfile=f"a/{filename}", tofile=f"b/{filename}")
-        return "".join(diff)
+        return "".join(diff) or None
+    
+    def _marku_api(self) -> Tuple:
+        """返回 (ModuleContext, REGISTRY, create, GitUndoManager)，首次解析后缓存在实例上"""
+        if self._api is None:
+            module = self.get_module()
+            self._api = (
+                module["ModuleContext"],
+                module["REGISTRY"],
+                module["create"],
+                module["GitUndoManager"],
+            )
+        return self._api
+    
+    @classmethod
+    def _snapshot_result(cls, ctx, module_name: str) -> Tuple[int, int, List[Dict]]:
+        """
+        读取模块本次运行的结果 (files, changed, diffs)
+        
+        模块可能原地复用 ctx.shared 中的结果字典及其 diffs 列表，
+        因此每次运行后立即取值。diffs 只复制 _collect_diffs 会用到的部分：
+        每个文件多取一行、超出总量后多留一条，供其判断是否截断。
+        """
+        result = ctx.shared.get(module_name)
+        if not result:
+            return 0, 0, []
+        diffs = []
+        remaining = cls.MAX_TOTAL_DIFF_ENTRIES
+        for d in result.get("diffs", ()):
+            lines = d.get("diff", [])
+            diffs.append({"file": d.get("file", ""), "diff": lines[:cls.MAX_FILE_DIFF_ENTRIES + 1]})
+            if remaining <= 0:
+                break
+            remaining -= min(cls.MAX_FILE_DIFF_ENTRIES, len(lines))
+        return result.get("files", 0), result.get("changed", 0), diffs
+    
+    def _collect_diffs(self, diff_groups) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        按单文件与总量上限收集 diffs，返回 (diffs, 是否截断)
+        
+        总量用尽后不再为剩余文件分配切片。
+        """
+        all_diffs = []
+        truncated = False
+        remaining = self.MAX_TOTAL_DIFF_ENTRIES
+        for diffs in diff_groups:
+            for d in diffs:
+                lines = d.get("diff", [])
+                take = min(self.MAX_FILE_DIFF_ENTRIES, remaining)
+                if take <= 0:
+                    return all_diffs, True
+                if len(lines) > take:
+                    truncated = True
+                all_diffs.append({"file": d.get("file", ""), "diff": lines[:take]})
+                remaining -= min(take, len(lines))
+        return all_diffs, truncated
+    
+    def _path_config(self, path: Path, input_data: MarkuInput) -> Dict[str, Any]:
+        """构建单个路径的模块配置"""
+        return {
+            "input": str(path),
+            "recursive": input_data.recursive,
+            "verbose": True,
+            **input_data.step_config,
+        }
+    
+    async def _run_parallel(
+        self,
+        ModuleContext,
+        create,
+        root: Path,
+        paths: List[Path],
+        input_data: MarkuInput,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+        on_log: Optional[Callable[[str], None]] = None
+    ) -> List[Tuple[int, int, List[Dict]]]:
+        """
+        在线程池中并行处理多个路径，按输入顺序返回各路径的结果
+        
+        每个路径使用独立的 ModuleContext 和模块实例，避免共享状态写冲突。
+        """
+        total = len(paths)
+        finished = itertools.count(1)
+        
+        def run_one(path: Path) -> Tuple[int, int, List[Dict]]:
+            if on_log:
+                on_log(f"📄 处理: {path}")
+            ctx = ModuleContext(root=root)
+            if input_data.dry_run:
+                ctx.shared['__dry_run'] = True
+            create(input_data.module).run(ctx, self._path_config(path, input_data))
+            done = next(finished)
+            if on_progress:
+                on_progress(int((done / total) * 80), f"处理: {path.name}")
+            return self._snapshot_result(ctx, input_data.module)
+        
+        loop = asyncio.get_running_loop()
+        max_workers = min(self.MAX_PARALLEL_WORKERS, total)
+        # 信号量限制同时提交到线程池的路径数，即同时打开的文件数
+        slots = asyncio.BoundedSemaphore(max_workers)
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        
+        async def submit(path: Path) -> Tuple[int, int, List[Dict]]:
+            async with slots:
+                return await loop.run_in_executor(pool, run_one, path)
+        
+        try:
+            return await asyncio.gather(*(submit(path) for path in paths))
+        finally:
+            # 出错或被取消时不在事件循环中等待剩余任务，未开始的任务直接取消
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _process_text(
+        self,
+        ModuleContext,
+        mod,
+        module_name: str,
+        text: str,
+        step_config: Dict[str, Any]
+    ) -> str:
+        """
+        处理文本输入并返回处理结果
+        
+        模块提供 run_text 时全程在内存中处理；否则回退到临时文件，
+        由 mod.run 读写该文件。文本模式下始终 dry_run=False 以便获取结果。
+        """
+        if hasattr(mod, "run_text"):
+            ctx = ModuleContext(root=Path(tempfile.gettempdir()))
+            ctx.shared['__inline_input'] = text
+            ctx.shared['__inline_mode'] = True
+            config = {"recursive": False, "verbose": False, **step_config}
+            result = mod.run_text(ctx, text, config)
+            if isinstance(result, str):
+                return result
+            return ctx.shared[module_name]['output']
+        
+        # 复用实例级临时目录中的固定缓冲文件，写入时截断旧内容；
+        # 缓冲文件被占用时（并发调用）回退到一次性临时文件
+        if not self._buffer_lock.acquire(blocking=False):
+            return self._process_text_tempfile(ModuleContext, mod, text, step_config)
+        try:
+            if self._tmpdir is None:
+                self._tmpdir = tempfile.TemporaryDirectory(prefix="marku_")
+            buffer_path = Path(self._tmpdir.name) / "buf.md"
+            buffer_path.write_text(text, encoding='utf-8')
+            return self._run_on_file(ModuleContext, mod, buffer_path, step_config)
+        finally:
+            self._buffer_lock.release()
+    
+    def _process_text_tempfile(
+        self,
+        ModuleContext,
+        mod,
+        text: str,
+        step_config: Dict[str, Any]
+    ) -> str:
+        """使用一次性临时文件处理文本"""
+        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False, encoding='utf-8')
+        temp_file.write(text)
+        temp_file.close()
+        temp_path = Path(temp_file.name)
+        
+        try:
+            return self._run_on_file(ModuleContext, mod, temp_path, step_config)
+        finally:
+            temp_path.unlink(missing_ok=True)
+    
+    def _run_on_file(
+        self,
+        ModuleContext,
+        mod,
+        file_path: Path,
+        step_config: Dict[str, Any]
+    ) -> str:
+        """对单个文件运行模块并返回处理后的内容"""
+        ctx = ModuleContext(root=file_path.parent)
+        config = {
+            "input": str(file_path),
+            "recursive": False,
+            "verbose": False,
+            **step_config,
+        }
+        mod.run(ctx, config)
+        
+        # 读取处理后的内容
+        return file_path.read_text(encoding='utf-8')
     
     async def execute(
         self,
@@ -77,106 +325,221 @@ class MarkuAdapter(BaseAdapter):
         on_log: Optional[Callable[[str], None]] = None
     ) -> MarkuOutput:
         """执行 marku 处理"""
-        module = self.get_module()
-        ModuleContext = module["ModuleContext"]
-        REGISTRY = module["REGISTRY"]
-        create = module["create"]
-        GitUndoManager = module["GitUndoManager"]
-        
-        # 处理撤销操作
-        if input_data.action == "undo":
+        handler = self._ACTIONS.get(input_data.action)
+        if handler is None:
+            return MarkuOutput(success=False, message=f"未知操作: {input_data.action}")
+        return await getattr(self, handler)(input_data, on_progress, on_log)
+    
+    async def _undo(
+        self,
+        input_data: MarkuInput,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+        on_log: Optional[Callable[[str], None]] = None
+    ) -> MarkuOutput:
+        """撤销最近一次 marku 运行"""
+        GitUndoManager = self._marku_api()[3]
+        if on_log:
+            on_log("⏪ 执行撤销...")
+        try:
+            if GitUndoManager is None:
+                return MarkuOutput(success=False, message="Git 撤销模块未安装")
+            mgr = GitUndoManager(Path.cwd())
+            success = mgr.undo_latest()
+            if success:
+                return MarkuOutput(success=True, message="撤销成功")
+            else:
+                return MarkuOutput(success=False, message="无可撤销的操作")
+        except Exception as e:
+            return MarkuOutput(success=False, message=f"撤销失败: {e}")
+    
+    async def _history(
+        self,
+        input_data: MarkuInput,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+        on_log: Optional[Callable[[str], None]] = None
+    ) -> MarkuOutput:
+        """查看撤销历史"""
+        GitUndoManager = self._marku_api()[3]
+        try:
+            if GitUndoManager is None:
+                return MarkuOutput(success=False, message="Git 撤销模块未安装")
+            mgr = GitUndoManager(Path.cwd())
+            records = mgr.get_history(10)
+            history_text = "\n".join([f"{r['id']}: {r['summary']}" for r in records])
             if on_log:
-                on_log("⏪ 执行撤销...")
+                on_log(f"📜 历史记录:\n{history_text}")
+            return MarkuOutput(success=True, message=f"找到 {len(records)} 条记录")
+        except Exception as e:
+            return MarkuOutput(success=False, message=f"获取历史失败: {e}")
+    
+    async def _commit_batch(
+        self,
+        input_data: MarkuInput,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+        on_log: Optional[Callable[[str], None]] = None
+    ) -> MarkuOutput:
+        """为批次内推迟的所有运行保存一个撤销点"""
+        if not input_data.batch_id:
+            return MarkuOutput(success=False, message="未指定批次 ID")
+        
+        keys = [key for key in _pending_undo if key[0] == input_data.batch_id]
+        if not keys:
+            return MarkuOutput(success=False, message=f"批次不存在或已提交: {input_data.batch_id}")
+        
+        undo_sha = None
+        try:
+            for key in keys:
+                batch = _pending_undo.get(key)
+                if batch is not None:
+                    undo_sha = await self._flush_batch(key, batch, on_log) or undo_sha
+        except Exception as e:
+            return MarkuOutput(success=False, message=f"保存撤销点失败: {e}")
+        return MarkuOutput(success=True, message=f"批次 {input_data.batch_id} 已提交", undo_sha=undo_sha)
+    
+    @staticmethod
+    def _save_batch(batch: "_PendingUndo", on_log: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """保存批次的撤销点并返回 SHA"""
+        undo_sha = batch.manager.save_state(f"marku batch: {', '.join(batch.modules)}")
+        if undo_sha and on_log:
+            on_log(f"💾 已保存撤销点: {undo_sha[:8]}")
+        return undo_sha
+    
+    async def _flush_batch(
+        self,
+        key: Tuple[str, str],
+        batch: "_PendingUndo",
+        on_log: Optional[Callable[[str], None]] = None
+    ) -> Optional[str]:
+        """
+        在线程中保存批次撤销点（git 操作，不阻塞事件循环）
+        
+        保存期间批次移出待提交列表，避免被重复保存；失败时放回，可重试提交
+        """
+        if _pending_undo.get(key) is not batch:
+            return None
+        del _pending_undo[key]
+        try:
+            return await asyncio.to_thread(self._save_batch, batch, on_log)
+        except Exception:
+            _pending_undo.setdefault(key, batch)
+            raise
+    
+    async def _flush_stale_batches(self, on_log: Optional[Callable[[str], None]] = None) -> None:
+        """
+        提交超过 BATCH_UNDO_TIMEOUT 仍未提交的批次，避免撤销点一直悬空
+        
+        批次到期时由事件循环定时调用，批次运行时也会检查一次；保存失败的批次保留待下次重试
+        """
+        deadline = time.monotonic() - self.BATCH_UNDO_TIMEOUT
+        for key, batch in [(key, batch) for key, batch in _pending_undo.items() if batch.started <= deadline]:
             try:
-                if GitUndoManager is None:
-                    return MarkuOutput(success=False, message="Git 撤销模块未安装")
-                mgr = GitUndoManager(Path.cwd())
-                success = mgr.undo_latest()
-                if success:
-                    return MarkuOutput(success=True, message="撤销成功")
-                else:
-                    return MarkuOutput(success=False, message="无可撤销的操作")
+                await self._flush_batch(key, batch, on_log)
             except Exception as e:
-                return MarkuOutput(success=False, message=f"撤销失败: {e}")
+                if on_log:
+                    on_log(f"⚠️ 批次 {key[0]} 撤销点保存失败: {e}")
+    
+    def _on_batch_timeout(self, key: Tuple[str, str], batch: "_PendingUndo") -> None:
+        """
+        批次到期的定时回调
         
-        # 处理 history 操作
-        if input_data.action == "history":
+        事件循环时钟精度有限，回调可能略早触发，此时按剩余时间重新定时
+        """
+        if _pending_undo.get(key) is not batch:
+            return
+        loop = asyncio.get_running_loop()
+        remaining = batch.started + self.BATCH_UNDO_TIMEOUT - time.monotonic()
+        if remaining > 0:
+            loop.call_later(remaining, self._on_batch_timeout, key, batch)
+            return
+        task = loop.create_task(self._flush_stale_batches())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+    
+    async def close(self) -> None:
+        """应用关闭时保存所有仍未提交的批次撤销点"""
+        for key, batch in list(_pending_undo.items()):
             try:
-                if GitUndoManager is None:
-                    return MarkuOutput(success=False, message="Git 撤销模块未安装")
-                mgr = GitUndoManager(Path.cwd())
-                records = mgr.get_history(10)
-                history_text = "\n".join([f"{r['id']}: {r['summary']}" for r in records])
-                if on_log:
-                    on_log(f"📜 历史记录:\n{history_text}")
-                return MarkuOutput(success=True, message=f"找到 {len(records)} 条记录")
-            except Exception as e:
-                return MarkuOutput(success=False, message=f"获取历史失败: {e}")
+                await self._flush_batch(key, batch)
+            except Exception:
+                continue
+    
+    async def _run(
+        self,
+        input_data: MarkuInput,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+        on_log: Optional[Callable[[str], None]] = None
+    ) -> MarkuOutput:
+        """运行处理模块：有 input_text 时处理文本，否则处理文件路径"""
+        REGISTRY = self._marku_api()[1]
         
         # 检查模块是否存在
         if input_data.module not in REGISTRY:
             return MarkuOutput(success=False, message=f"未知模块: {input_data.module}")
         
-        # ========== 文本直接处理模式 ==========
         if input_data.input_text:
-            original_text = input_data.input_text
-            if on_log:
-                on_log(f"📝 处理文本输入 ({len(original_text)} 字符)")
+            return await self._run_text(input_data, on_progress, on_log)
+        return await self._run_files(input_data, on_progress, on_log)
+    
+    async def _run_text(
+        self,
+        input_data: MarkuInput,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+        on_log: Optional[Callable[[str], None]] = None
+    ) -> MarkuOutput:
+        """文本直接处理模式"""
+        ModuleContext, _, create, _ = self._marku_api()
+        original_text = input_data.input_text
+        if on_log:
+            on_log(f"📝 处理文本输入 ({len(original_text)} 字符)")
+        
+        try:
+            mod = create(input_data.module)
+            # 模块处理与缓冲文件读写都是阻塞操作，放到线程中执行；
+            # 并发请求同时处理时，第二个请求拿不到缓冲文件锁，改用一次性临时文件
+            processed_text = await asyncio.to_thread(
+                self._process_text,
+                ModuleContext, mod, input_data.module, original_text, input_data.step_config
+            )
             
-            # 创建临时文件
-            temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False, encoding='utf-8')
-            temp_file.write(original_text)
-            temp_file.close()
-            temp_path = Path(temp_file.name)
+            changed = original_text != processed_text
             
-            try:
-                # 创建上下文 (文本模式下始终 dry_run=False 以便获取结果)
-                ctx = ModuleContext(root=temp_path.parent)
-                
-                mod = create(input_data.module)
-                config = {
-                    "input": str(temp_path),
-                    "recursive": False,
-                    "verbose": False,
-                    **input_data.step_config,
-                }
-                
-                mod.run(ctx, config)
-                
-                # 读取处理后的内容
-                processed_text = temp_path.read_text(encoding='utf-8')
-                
-                # 生成 Diff
+            # 仅在有变更且调用方需要时生成 Diff
+            diff_text = None
+            if changed and input_data.include_diff:
                 diff_text = self._generate_unified_diff(original_text, processed_text)
-                
-                if on_progress:
-                    on_progress(100, "完成")
-                
-                changed = original_text != processed_text
-                if on_log:
-                    if changed:
-                        on_log(f"✅ 文本已处理，有变更")
-                    else:
-                        on_log(f"✅ 文本已处理，无变更")
-                
-                return MarkuOutput(
-                    success=True,
-                    message="文本处理完成" + (" (有变更)" if changed else " (无变更)"),
-                    files_processed=1,
-                    files_changed=1 if changed else 0,
-                    input_text=original_text,
-                    output_text=processed_text,
-                    diff_text=diff_text if changed else None,
-                )
-            except Exception as e:
-                if on_log:
-                    on_log(f"❌ 处理失败: {e}")
-                return MarkuOutput(success=False, message=f"处理失败: {e}")
-            finally:
-                temp_path.unlink(missing_ok=True)
-        
-        # ========== 文件处理模式 ==========
-        paths = [Path(p.strip().strip('"\'')) for p in input_data.paths if p.strip()]
+            
+            if on_progress:
+                on_progress(100, "完成")
+            
+            if on_log:
+                if changed:
+                    on_log(f"✅ 文本已处理，有变更")
+                else:
+                    on_log(f"✅ 文本已处理，无变更")
+            
+            return MarkuOutput(
+                success=True,
+                message="文本处理完成" + (" (有变更)" if changed else " (无变更)"),
+                files_processed=1,
+                files_changed=1 if changed else 0,
+                input_text=original_text,
+                output_text=processed_text,
+                diff_text=diff_text,
+            )
+        except Exception as e:
+            if on_log:
+                on_log(f"❌ 处理失败: {e}")
+            return MarkuOutput(success=False, message=f"处理失败: {e}")
+    
+    async def _run_files(
+        self,
+        input_data: MarkuInput,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+        on_log: Optional[Callable[[str], None]] = None
+    ) -> MarkuOutput:
+        """文件处理模式"""
+        ModuleContext, _, create, GitUndoManager = self._marku_api()
+        paths = [_path(p) for p in (strip_quotes(raw) for raw in input_data.paths) if p]
         
         if not paths:
             return MarkuOutput(success=False, message="没有有效的输入路径或文本")
@@ -189,54 +552,68 @@ class MarkuAdapter(BaseAdapter):
             ctx.shared['__dry_run'] = True
         
         # 启用 Git 撤销
+        batch = None
         if input_data.enable_undo and not input_data.dry_run and GitUndoManager:
             try:
-                ctx.undo_manager = GitUndoManager(root)
-                if ctx.undo_manager.is_dirty():
-                    ctx.undo_manager.save_state("Auto-save before marku run")
+                if input_data.batch_id:
+                    # 批次内复用同一管理器，只在批次开始时自动保存一次
+                    await self._flush_stale_batches(on_log)
+                    key = (input_data.batch_id, str(root))
+                    batch = _pending_undo.get(key)
+                    if batch is None:
+                        manager = GitUndoManager(root)
+                        if manager.is_dirty():
+                            manager.save_state("Auto-save before marku batch")
+                        batch = _pending_undo[key] = _PendingUndo(manager, time.monotonic())
+                        # 批次被遗弃（不再有运行或 commit_batch）时也按时保存
+                        asyncio.get_running_loop().call_later(
+                            self.BATCH_UNDO_TIMEOUT, self._on_batch_timeout, key, batch
+                        )
+                    batch.modules.setdefault(input_data.module, None)
+                    ctx.undo_manager = batch.manager
+                else:
+                    ctx.undo_manager = GitUndoManager(root)
+                    if ctx.undo_manager.is_dirty():
+                        ctx.undo_manager.save_state("Auto-save before marku run")
             except Exception as e:
                 if on_log:
                     on_log(f"⚠️ Git 撤销初始化失败: {e}")
         
         # 执行模块
-        total_files = 0
-        total_changed = 0
-        all_diffs = []
-        
         try:
-            mod = create(input_data.module)
+            # 无撤销管理器时各路径互不依赖，路径较多则并行处理
+            parallel = (
+                len(paths) >= self.PARALLEL_MIN_PATHS
+                and getattr(ctx, 'undo_manager', None) is None
+            )
             
-            for i, path in enumerate(paths):
-                if on_progress:
-                    on_progress(int((i / len(paths)) * 80), f"处理: {path.name}")
-                if on_log:
-                    on_log(f"📄 处理: {path}")
-                
-                config = {
-                    "input": str(path),
-                    "recursive": input_data.recursive,
-                    "verbose": True,
-                    **input_data.step_config,
-                }
-                
-                mod.run(ctx, config)
-                
-                # 收集结果
-                result = ctx.shared.get(input_data.module, {})
-                total_files += result.get("files", 0)
-                total_changed += result.get("changed", 0)
-                
-                # 收集 diffs
-                diffs = result.get("diffs", [])
-                for d in diffs:
-                    all_diffs.append({
-                        "file": d.get("file", ""),
-                        "diff": d.get("diff", [])[:100]
-                    })
+            if parallel:
+                results = await self._run_parallel(
+                    ModuleContext, create, root, paths, input_data, on_progress, on_log
+                )
+            else:
+                mod = create(input_data.module)
+                results = []
+                for i, path in enumerate(paths):
+                    if on_progress:
+                        on_progress(int((i / len(paths)) * 80), f"处理: {path.name}")
+                    if on_log:
+                        on_log(f"📄 处理: {path}")
+                    
+                    mod.run(ctx, self._path_config(path, input_data))
+                    results.append(self._snapshot_result(ctx, input_data.module))
+            
+            # 收集结果：循环结束后统一归并
+            total_files = sum(r[0] for r in results)
+            total_changed = sum(r[1] for r in results)
+            all_diffs, diffs_truncated = self._collect_diffs(r[2] for r in results)
             
-            # 保存撤销点
+            # 保存撤销点（批次模式下推迟到 commit_batch 统一保存）
             undo_sha = None
-            if hasattr(ctx, 'undo_manager') and ctx.undo_manager and not input_data.dry_run:
+            if batch is not None:
+                if on_log:
+                    on_log(f"🕒 撤销点将在批次 {input_data.batch_id} 提交时保存")
+            elif hasattr(ctx, 'undo_manager') and ctx.undo_manager and not input_data.dry_run:
                 undo_sha = ctx.undo_manager.save_state(f"marku run: {input_data.module}")
                 if undo_sha and on_log:
                     on_log(f"💾 已保存撤销点: {undo_sha[:8]}")
@@ -250,6 +627,7 @@ class MarkuAdapter(BaseAdapter):
                 files_processed=total_files,
                 files_changed=total_changed,
                 diffs=all_diffs,
+                diffs_truncated=diffs_truncated,
                 undo_sha=undo_sha,
             )
             
@@ -257,4 +635,3 @@ class MarkuAdapter(BaseAdapter):
             if on_log:
                 on_log(f"❌ 处理失败: {e}")
             return MarkuOutput(success=False, message=f"处理失败: {e}")
-
@@ -8,37 +8,23 @@ migratef 适配器
 3. direct: 直接迁移（类似mv命令，整个文件/文件夹作为单位）
 """
 
-import io
+import asyncio
+import itertools
 import os
-import sys
 from typing import Callable, Dict, List, Optional
 
 from pydantic import Field
 
-from .base import BaseAdapter, AdapterInput, AdapterOutput
+from .base import BaseAdapter, AdapterInput, AdapterOutput, ensure_utf8_output, strip_quotes
 
 
-def _ensure_utf8_output():
-    """确保 stdout/stderr 使用 UTF-8 编码"""
-    if sys.platform == 'win32':
-        os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
-        if hasattr(sys.stdout, 'buffer'):
-            sys.stdout = io.TextIOWrapper(
-                sys.stdout.buffer, 
-                encoding='utf-8', 
-                errors='replace',
-                line_buffering=True
-            )
-        if hasattr(sys.stderr, 'buffer'):
-            sys.stderr = io.TextIOWrapper(
-                sys.stderr.buffer, 
-                encoding='utf-8', 
-                errors='replace',
-                line_buffering=True
-            )
-
-
-_ensure_utf8_output()
+async def _heartbeat(on_progress: Callable[[int, str], None], interval: float = 1.0) -> None:
+    """迁移进行中定期报告已用时间，直到被取消"""
+    elapsed = 0.0
+    while True:
+        await asyncio.sleep(interval)
+        elapsed += interval
+        on_progress(10, f"正在迁移... 已用 {int(elapsed)} 秒")
 
 
 class MigrateFInput(AdapterInput):
@@ -79,6 +65,13 @@ class MigrateFAdapter(BaseAdapter):
     input_schema = MigrateFInput
     output_schema = MigrateFOutput
     
+    # 并发检查源路径存在性时同时进行的数量上限
+    PATH_CHECK_CONCURRENCY = 32
+    
+    def __init__(self):
+        super().__init__()
+        ensure_utf8_output()
+    
     def _import_module(self) -> Dict:
         """懒加载导入 migratef 模块"""
         from migratef.core.migration_service import MigrationService
@@ -199,29 +192,34 @@ class MigrateFAdapter(BaseAdapter):
     ) -> MigrateFOutput:
         """执行文件迁移"""
         
-        # 收集源路径，去除引号
-        source_paths = list(input_data.source_paths) if input_data.source_paths else []
-        if input_data.path:
-            path = input_data.path.strip().strip('"')
-            if path not in source_paths:
-                source_paths.append(path)
-        
-        # 处理所有路径的引号
-        source_paths = [p.strip().strip('"') for p in source_paths]
+        # 收集源路径，单次去除空白和引号，并按首次出现顺序去重
+        paths_iter = itertools.chain(
+            input_data.source_paths or (),
+            (input_data.path,) if input_data.path else ()
+        )
+        source_paths = list(dict.fromkeys(
+            path for path in (strip_quotes(p) for p in paths_iter if p) if path
+        ))
         
         if not source_paths:
             return MigrateFOutput(success=False, message="未指定源路径")
         
         # 目标路径也去除引号
-        target_path = input_data.target_path.strip().strip('"') if input_data.target_path else ""
+        target_path = strip_quotes(input_data.target_path) if input_data.target_path else ""
         if not target_path:
             return MigrateFOutput(success=False, message="未指定目标路径")
         
-        # 验证源路径存在
-        from pathlib import Path
+        # 并发验证源路径存在（远程路径不再逐个串行等待），结果保持原顺序
+        semaphore = asyncio.BoundedSemaphore(self.PATH_CHECK_CONCURRENCY)
+        
+        async def _exists(p: str) -> bool:
+            async with semaphore:
+                return await asyncio.to_thread(os.path.exists, p)
+        
+        exists = await asyncio.gather(*(_exists(p) for p in source_paths))
         valid_paths = []
-        for p in source_paths:
-            if Path(p).exists():
+        for p, ok in zip(source_paths, exists):
+            if ok:
                 valid_paths.append(p)
             elif on_log:
                 on_log(f"跳过不存在: {p}")
@@ -247,14 +245,21 @@ class MigrateFAdapter(BaseAdapter):
             module = self.get_module()
             MigrationService = module['MigrationService']
             
+            # 迁移在线程中执行（migratef 内部自带线程池），期间事件循环保持响应并发送心跳进度
             service = MigrationService()
-            result = service.execute_migration(
-                source_paths=valid_paths,
-                target_dir=target_path,
-                migration_mode=mode,
-                action_type=action,
-                max_workers=input_data.max_workers or 16
-            )
+            heartbeat = asyncio.create_task(_heartbeat(on_progress)) if on_progress else None
+            try:
+                result = await asyncio.to_thread(
+                    service.execute_migration,
+                    source_paths=valid_paths,
+                    target_dir=target_path,
+                    migration_mode=mode,
+                    action_type=action,
+                    max_workers=input_data.max_workers or 16
+                )
+            finally:
+                if heartbeat:
+                    heartbeat.cancel()
             
             if on_progress:
                 on_progress(100, "完成")
@@ -5,15 +5,68 @@ movea 适配器
 直接调用 movea 源码的核心函数
 """
 
+import asyncio
+import os
+import re
+import shutil
 import sys
+from collections import defaultdict
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
 from pydantic import BaseModel, Field
 
 from .base import BaseAdapter, AdapterOutput
 
 
+# movea 源码路径，导入时加入 sys.path
+_MOVEA_SRC = str(Path(__file__).parent.parent.parent.parent / "ImageAll" / "MangaClassify" / "ArtistPreview" / "src")
+_movea_src_inserted = False
+
+# 以数字编号开头的二级文件夹（如 "1. 同人志"、"2) 画集"）
+_NUMBERED_FOLDER_RE = re.compile(r'^\d+[\.\)\]\s]*')
+
+
+def _move_into(level1_path: str, target_folder: str, item_names: List[str]) -> List[Optional[Exception]]:
+    """
+    将一级文件夹下的多个项目移动到同一目标子文件夹，返回每项的异常（成功为 None）
+    
+    源和目标都在 level1_path 下，通常位于同一文件系统，直接 os.rename；
+    目标已存在（os.rename 会替换空目录或文件，而 shutil.move 会移入已有目录）
+    或 rename 失败（如目标是跨盘的链接目录）时使用 shutil.move，行为与逐项 shutil.move 一致。
+    """
+    target_dir = os.path.join(level1_path, target_folder)
+    try:
+        os.makedirs(target_dir, exist_ok=True)
+    except OSError as e:
+        return [e] * len(item_names)
+    
+    # 循环外算好带分隔符的前缀，循环内只做字符串拼接
+    source_prefix = os.path.join(level1_path, '')
+    target_prefix = os.path.join(target_dir, '')
+    rename = os.rename
+    lexists = os.path.lexists
+    
+    errors: List[Optional[Exception]] = []
+    for item_name in item_names:
+        source_path = source_prefix + item_name
+        target_path = target_prefix + item_name
+        try:
+            if lexists(target_path):
+                shutil.move(source_path, target_path)
+            else:
+                try:
+                    rename(source_path, target_path)
+                except OSError:
+                    if not lexists(source_path):
+                        raise
+                    shutil.move(source_path, target_path)
+            errors.append(None)
+        except Exception as e:
+            errors.append(e)
+    return errors
+
+
 class MoveaInput(BaseModel):
     """movea 输入参数"""
     action: str = Field(default="scan", description="操作类型: scan, move, move_single")
@@ -24,6 +77,10 @@ class MoveaInput(BaseModel):
     # 移动操作参数
     level1_name: str = Field(default="", description="一级文件夹名称")
     move_plan: Dict[str, Optional[str]] = Field(default_factory=dict, description="移动计划")
+    move_plan_v2: List[Tuple[str, str, Optional[str]]] = Field(
+        default_factory=list,
+        description="结构化移动计划 [(类型 file/folder, 名称, 目标文件夹)]，提供时优先于 move_plan"
+    )
 
 
 class ScanResultItem(BaseModel):
@@ -74,10 +131,12 @@ class MoveaAdapter(BaseAdapter):
                 "config": MoveaAdapter._config_module
             }
         
-        # 添加源码路径
-        movea_src = Path(__file__).parent.parent.parent.parent / "ImageAll" / "MangaClassify" / "ArtistPreview" / "src"
-        if str(movea_src) not in sys.path:
-            sys.path.insert(0, str(movea_src))
+        # 添加源码路径（每个进程只插入一次）
+        global _movea_src_inserted
+        if not _movea_src_inserted:
+            if _MOVEA_SRC not in sys.path:
+                sys.path.insert(0, _MOVEA_SRC)
+            _movea_src_inserted = True
         
         try:
             from movea import scanner, file_ops, config
@@ -139,74 +198,25 @@ class MoveaAdapter(BaseAdapter):
             config = modules["config"]
             file_ops = modules["file_ops"]
             
-            import os
-            import re
-            
             # 直接实现扫描逻辑（避免 streamlit 依赖）
             if not os.path.exists(root_path):
                 return MoveaOutput(success=False, message=f"路径不存在: {root_path}")
             
             # 加载黑名单
-            blacklist = set()
+            blacklist = frozenset()
             try:
-                blacklist = config.load_blacklist()
+                blacklist = frozenset(config.load_blacklist())
             except:
                 pass
             
-            results = {}
-            items = os.listdir(root_path)
-            total_items = len(items)
-            
-            for idx, item in enumerate(items):
-                if on_progress:
-                    progress = 10 + int((idx / total_items) * 80)
-                    on_progress(progress, f"扫描: {item}")
-                
-                level1_path = os.path.join(root_path, item)
-                if not os.path.isdir(level1_path):
-                    continue
-                
-                # 跳过黑名单
-                if item in blacklist:
-                    continue
-                
-                # 获取二级文件夹、压缩包和可移动文件夹
-                subfolders = []
-                archives = []
-                movable_folders = []
-                
-                for subitem in os.listdir(level1_path):
-                    subitem_path = os.path.join(level1_path, subitem)
-                    if os.path.isdir(subitem_path):
-                        subfolders.append(subitem)
-                    elif os.path.isfile(subitem_path) and file_ops.is_archive(subitem_path):
-                        archives.append(subitem)
-                
-                # 可移动的文件夹：不以数字开头的文件夹
-                for folder in subfolders[:]:
-                    if not re.match(r'^\d+[\.\)\]\s]*', folder):
-                        movable_folders.append(folder)
-                        subfolders.remove(folder)
-                
-                if (archives or movable_folders) and subfolders:
-                    # 检查是否有"同人志"文件夹
-                    has_doujinshi = any("同人志" in folder for folder in subfolders)
-                    warning_message = None if has_doujinshi else "⚠️ 此文件夹没有'同人志'二级文件夹"
-                    
-                    results[item] = {
-                        'path': level1_path,
-                        'subfolders': sorted(subfolders),
-                        'archives': archives,
-                        'movable_folders': movable_folders,
-                        'warning': warning_message
-                    }
+            # 目录遍历是阻塞 IO，放到线程中执行以免卡住事件循环
+            results, total_archives, total_movable = await asyncio.to_thread(
+                self._scan_sync, root_path, blacklist, file_ops, on_progress
+            )
             
             if on_progress:
                 on_progress(100, "扫描完成")
             
-            total_archives = sum(len(data['archives']) for data in results.values())
-            total_movable = sum(len(data.get('movable_folders', [])) for data in results.values())
-            
             if on_log:
                 on_log(f"✅ 扫描完成，找到 {len(results)} 个一级文件夹")
                 on_log(f"📦 压缩包: {total_archives} 个")
@@ -232,6 +242,87 @@ class MoveaAdapter(BaseAdapter):
                 on_log(f"❌ 扫描失败: {e}")
             return MoveaOutput(success=False, message=f"扫描失败: {e}")
     
+    @staticmethod
+    def _scan_sync(
+        root_path: str,
+        blacklist,
+        file_ops,
+        on_progress: Optional[Callable[[int, str], None]] = None
+    ) -> Tuple[Dict[str, Dict], int, int]:
+        """同步扫描一级文件夹，返回 ({一级文件夹名: 扫描结果}, 压缩包总数, 可移动文件夹总数)"""
+        results = {}
+        total_archives = 0
+        total_movable = 0
+        match_numbered = _NUMBERED_FOLDER_RE.match
+        # scandir 的目录项自带类型信息，is_dir/is_file 通常无需额外 stat
+        with os.scandir(root_path) as it:
+            entries = list(it)
+        total_items = len(entries)
+        # 只在进度百分比变化时回调，避免大目录下逐项回调
+        last_progress = -1
+        # 预先算好每项对应的进度增量，循环内只做乘法；空目录时为 0
+        progress_step = 80.0 / total_items if total_items else 0.0
+        
+        for idx, entry in enumerate(entries):
+            item = entry.name
+            if on_progress:
+                progress = 10 + int(idx * progress_step)
+                if progress != last_progress:
+                    last_progress = progress
+                    on_progress(progress, f"扫描: {item}")
+            
+            level1_path = entry.path
+            if not entry.is_dir():
+                continue
+            
+            # 跳过黑名单
+            if item in blacklist:
+                continue
+            
+            # 获取二级文件夹、压缩包和可移动文件夹
+            # 单次遍历完成分类：编号文件夹为二级文件夹，不以数字开头的为可移动文件夹
+            subfolders = []
+            files = []
+            movable_folders = []
+            has_doujinshi = False
+            
+            with os.scandir(level1_path) as sub_it:
+                for sub in sub_it:
+                    name = sub.name
+                    if sub.is_dir():
+                        if match_numbered(name):
+                            subfolders.append(name)
+                            # 检查是否有"同人志"文件夹（已找到则不再做子串查找）
+                            if not has_doujinshi and "同人志" in name:
+                                has_doujinshi = True
+                        else:
+                            movable_folders.append(name)
+                    elif sub.is_file():
+                        files.append(sub)
+            
+            # 没有编号子文件夹，或既无文件也无可移动文件夹时不会产生结果，
+            # 直接跳过，省去对文件逐个调用 is_archive
+            if not subfolders or not (files or movable_folders):
+                continue
+            
+            archives = [f.name for f in files if file_ops.is_archive(f.path)]
+            
+            if archives or movable_folders:
+                subfolders.sort()
+                warning_message = None if has_doujinshi else "⚠️ 此文件夹没有'同人志'二级文件夹"
+                
+                results[item] = {
+                    'path': level1_path,
+                    'subfolders': subfolders,
+                    'archives': archives,
+                    'movable_folders': movable_folders,
+                    'warning': warning_message
+                }
+                total_archives += len(archives)
+                total_movable += len(movable_folders)
+        
+        return results, total_archives, total_movable
+    
     async def _match_archive(
         self,
         input_data: MoveaInput,
@@ -254,14 +345,12 @@ class MoveaAdapter(BaseAdapter):
         on_log: Optional[Callable[[str], None]] = None
     ) -> MoveaOutput:
         """执行单个文件夹的移动"""
-        import os
-        import shutil
-        
         level1_name = input_data.level1_name
         move_plan = input_data.move_plan
+        move_plan_v2 = input_data.move_plan_v2
         root_path = input_data.root_path
         
-        if not level1_name or not move_plan:
+        if not level1_name or not (move_plan or move_plan_v2):
             return MoveaOutput(success=False, message="缺少移动参数")
         
         level1_path = os.path.join(root_path, level1_name)
@@ -271,41 +360,52 @@ class MoveaAdapter(BaseAdapter):
         if on_progress:
             on_progress(10, f"开始移动 {level1_name}...")
         
+        # 按目标文件夹分组，每个目标目录只创建一次
+        by_target: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        if move_plan_v2:
+            # 结构化计划：(类型, 名称, 目标文件夹)
+            for kind, item_name, target_folder in move_plan_v2:
+                if target_folder:
+                    item_type = "文件夹" if kind == "folder" else "文件"
+                    by_target[target_folder].append((item_name, item_type))
+        else:
+            for item_key, target_folder in move_plan.items():
+                if target_folder is None:
+                    continue
+                
+                # 检查是文件还是文件夹（文件夹键带 "folder_" 前缀）
+                item_name = item_key.removeprefix("folder_")
+                item_type = "文件夹" if item_name != item_key else "文件"
+                by_target[target_folder].append((item_name, item_type))
+        
         success_count = 0
         error_count = 0
-        total_items = len([k for k, v in move_plan.items() if v is not None])
+        total_items = sum(len(items) for items in by_target.values())
         processed = 0
+        last_progress = -1
+        progress_step = 90.0 / total_items if total_items else 0.0
         
-        for item_key, target_folder in move_plan.items():
-            if target_folder is None:
-                continue
-            
-            # 检查是文件还是文件夹
-            if item_key.startswith("folder_"):
-                item_name = item_key[7:]  # 移除"folder_"前缀
-                item_type = "文件夹"
-            else:
-                item_name = item_key
-                item_type = "文件"
-            
-            source_path = os.path.join(level1_path, item_name)
-            target_path = os.path.join(level1_path, target_folder, item_name)
-            
-            try:
-                os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                shutil.move(source_path, target_path)
-                success_count += 1
-                if on_log:
-                    on_log(f"✅ {item_name} ({item_type}) -> {target_folder}")
-            except Exception as e:
-                error_count += 1
-                if on_log:
-                    on_log(f"❌ 移动失败 {item_name}: {e}")
+        for target_folder, items in by_target.items():
+            errors = await asyncio.to_thread(
+                _move_into, level1_path, target_folder, [name for name, _ in items]
+            )
             
-            processed += 1
-            if on_progress:
-                progress = 10 + int((processed / total_items) * 90)
-                on_progress(progress, f"移动中: {item_name}")
+            for (item_name, item_type), error in zip(items, errors):
+                if error is None:
+                    success_count += 1
+                    if on_log:
+                        on_log(f"✅ {item_name} ({item_type}) -> {target_folder}")
+                else:
+                    error_count += 1
+                    if on_log:
+                        on_log(f"❌ 移动失败 {item_name}: {error}")
+                
+                processed += 1
+                if on_progress:
+                    progress = 10 + int(processed * progress_step)
+                    if progress != last_progress:
+                        last_progress = progress
+                        on_progress(progress, f"移动中: {item_name}")
         
         if on_progress:
             on_progress(100, "移动完成")
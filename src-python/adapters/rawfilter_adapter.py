@@ -3,6 +3,7 @@ rawfilter 适配器
 相似文件过滤工具 - 分析并处理相似的压缩包文件
 """
 
+import asyncio
 import os
 from pathlib import Path
 from typing import Callable, Dict, List, Optional
@@ -12,6 +13,19 @@ from pydantic import Field
 from .base import BaseAdapter, AdapterInput, AdapterOutput
 
 
+def _scan_archives(path, archive_extensions) -> List[str]:
+    """列出目录下的压缩包文件名"""
+    # 扩展名统一为不带点的小写形式，先按名称过滤再判断是否为文件（与 Path.suffix 一致，忽略 .zip 这类隐藏文件名）
+    exts = frozenset(ext.lower().lstrip('.') for ext in archive_extensions)
+    with os.scandir(path) as it:
+        return [
+            entry.name for entry in it
+            if entry.name.rfind('.') > 0
+            and entry.name.rpartition('.')[2].lower() in exts
+            and entry.is_file()
+        ]
+
+
 class RawfilterInput(AdapterInput):
     """rawfilter 输入参数"""
     path: str = Field(..., description="要处理的目录路径")
@@ -48,8 +62,13 @@ class RawfilterAdapter(BaseAdapter):
     input_schema = RawfilterInput
     output_schema = RawfilterOutput
     
+    _cached_module: Optional[Dict] = None
+    
     def _import_module(self) -> Dict:
-        """懒加载导入 rawfilter 模块"""
+        """懒加载导入 rawfilter 模块（类级缓存，所有实例共享）"""
+        if RawfilterAdapter._cached_module is not None:
+            return RawfilterAdapter._cached_module
+        
         # 导入核心函数
         from rawfilter.__main__ import (
             group_similar_files,
@@ -57,11 +76,12 @@ class RawfilterAdapter(BaseAdapter):
             ARCHIVE_EXTENSIONS
         )
         
-        return {
+        RawfilterAdapter._cached_module = {
             'group_similar_files': group_similar_files,
             'process_file_group': process_file_group,
             'ARCHIVE_EXTENSIONS': ARCHIVE_EXTENSIONS
         }
+        return RawfilterAdapter._cached_module
     
     async def execute(
         self,
@@ -102,11 +122,8 @@ class RawfilterAdapter(BaseAdapter):
             if on_progress:
                 on_progress(10, "正在扫描文件...")
             
-            # 扫描压缩包文件
-            archive_files = []
-            for file in path.iterdir():
-                if file.is_file() and file.suffix.lower() in ARCHIVE_EXTENSIONS:
-                    archive_files.append(file.name)
+            # 扫描压缩包文件（阻塞 IO，放到线程中执行）
+            archive_files = await asyncio.to_thread(_scan_archives, path, ARCHIVE_EXTENSIONS)
             
             if not archive_files:
                 return RawfilterOutput(
@@ -121,7 +138,7 @@ class RawfilterAdapter(BaseAdapter):
                 on_progress(30, f"找到 {len(archive_files)} 个文件，正在分组...")
             
             # 分组相似文件
-            groups = group_similar_files(archive_files)
+            groups = await asyncio.to_thread(group_similar_files, archive_files)
             
             if on_log:
                 on_log(f"分成 {len(groups)} 个组")
@@ -131,31 +148,35 @@ class RawfilterAdapter(BaseAdapter):
             trash_dir.mkdir(exist_ok=True)
             
             # 统计结果
-            total_stats = {
-                'moved_to_trash': 0,
-                'moved_to_multi': 0,
-                'created_shortcuts': 0
-            }
+            moved_to_trash = 0
+            moved_to_multi = 0
+            created_shortcuts = 0
+            
+            # 只处理多文件组（单文件组无需处理），文件多的组优先
+            work = [(name, files) for name, files in groups.items() if len(files) > 1]
+            work.sort(key=lambda item: len(item[1]), reverse=True)
             
             # 处理每个组
             processed_groups = 0
-            for group_name, group_files in groups.items():
-                if len(group_files) <= 1:
-                    # 单文件组，跳过
-                    continue
-                
+            last_progress = -1
+            # 预先算好每组对应的进度增量，没有需要处理的组时为 0
+            progress_step = 60.0 / len(work) if work else 0.0
+            for group_name, group_files in work:
                 processed_groups += 1
-                progress = 30 + int(60 * processed_groups / len(groups))
+                progress = 30 + int(processed_groups * progress_step)
                 
-                if on_progress:
-                    on_progress(progress, f"处理组 {processed_groups}/{len(groups)}")
+                # 只在进度百分比变化时回调
+                if on_progress and progress != last_progress:
+                    last_progress = progress
+                    on_progress(progress, f"处理组 {processed_groups}/{len(work)}")
                 
                 if on_log:
                     on_log(f"处理组 [{group_name}]: {len(group_files)} 个文件")
                 
                 # 处理文件组
                 try:
-                    result_stats = process_file_group(
+                    result_stats = await asyncio.to_thread(
+                        process_file_group,
                         group_files,
                         str(path),
                         str(trash_dir),
@@ -165,10 +186,10 @@ class RawfilterAdapter(BaseAdapter):
                     )
                     
                     # 累加统计
-                    for key in total_stats:
-                        if key in result_stats:
-                            total_stats[key] += result_stats[key]
-                            
+                    moved_to_trash += result_stats.get('moved_to_trash', 0)
+                    moved_to_multi += result_stats.get('moved_to_multi', 0)
+                    created_shortcuts += result_stats.get('created_shortcuts', 0)
+                    
                 except Exception as e:
                     if on_log:
                         on_log(f"处理组 [{group_name}] 失败: {str(e)}")
@@ -176,10 +197,16 @@ class RawfilterAdapter(BaseAdapter):
             if on_progress:
                 on_progress(100, "处理完成")
             
+            total_stats = {
+                'moved_to_trash': moved_to_trash,
+                'moved_to_multi': moved_to_multi,
+                'created_shortcuts': created_shortcuts
+            }
+            
             message = (
                 f"处理完成: "
-                f"{total_stats['moved_to_trash']} 移到 trash, "
-                f"{total_stats['moved_to_multi']} 移到 multi"
+                f"{moved_to_trash} 移到 trash, "
+                f"{moved_to_multi} 移到 multi"
             )
             
             if on_log:
@@ -188,9 +215,9 @@ class RawfilterAdapter(BaseAdapter):
             return RawfilterOutput(
                 success=True,
                 message=message,
-                moved_to_trash=total_stats['moved_to_trash'],
-                moved_to_multi=total_stats['moved_to_multi'],
-                created_shortcuts=total_stats['created_shortcuts'],
+                moved_to_trash=moved_to_trash,
+                moved_to_multi=moved_to_multi,
+                created_shortcuts=created_shortcuts,
                 total_groups=processed_groups,
                 output_path=input_data.path,
                 stats=total_stats
@@ -7,42 +7,23 @@ repacku 适配器
 2. compress: 根据配置文件执行压缩
 """
 
-import io
+import asyncio
 import os
-import sys
+import stat
+from collections import Counter, deque
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, NamedTuple, Optional
 
 from pydantic import Field
 
-from .base import BaseAdapter, AdapterInput, AdapterOutput
+from .base import BaseAdapter, AdapterInput, AdapterOutput, ensure_utf8_output
 
 
-def _ensure_utf8_output():
-    """确保 stdout/stderr 使用 UTF-8 编码，避免 Windows GBK 编码问题"""
-    if sys.platform == 'win32':
-        # 设置环境变量强制 Python 使用 UTF-8
-        os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
-        
-        # 重新包装 stdout/stderr 使用 UTF-8 编码，忽略无法编码的字符
-        if hasattr(sys.stdout, 'buffer'):
-            sys.stdout = io.TextIOWrapper(
-                sys.stdout.buffer, 
-                encoding='utf-8', 
-                errors='replace',
-                line_buffering=True
-            )
-        if hasattr(sys.stderr, 'buffer'):
-            sys.stderr = io.TextIOWrapper(
-                sys.stderr.buffer, 
-                encoding='utf-8', 
-                errors='replace',
-                line_buffering=True
-            )
-
-
-# 在模块加载时执行编码适配
-_ensure_utf8_output()
+class _RepackuModule(NamedTuple):
+    """repacku 模块中用到的类与函数"""
+    FolderAnalyzer: type
+    analyze_folder: Callable
+    ZipCompressor: type
 
 
 class RepackuInput(AdapterInput):
@@ -85,16 +66,33 @@ class RepackuAdapter(BaseAdapter):
     input_schema = RepackuInput
     output_schema = RepackuOutput
     
-    def _import_module(self) -> Dict:
-        """懒加载导入 repacku 模块"""
+    # action -> 处理方法名；未列出的操作按 full 处理
+    _ACTIONS = {
+        "analyze": "_analyze",
+        "compress": "_compress",
+        "full": "_full",
+    }
+    
+    _cached_module: Optional[_RepackuModule] = None
+    
+    def __init__(self):
+        super().__init__()
+        ensure_utf8_output()
+    
+    def _import_module(self) -> _RepackuModule:
+        """懒加载导入 repacku 模块（类级缓存，所有实例共享）"""
+        if RepackuAdapter._cached_module is not None:
+            return RepackuAdapter._cached_module
+        
         from repacku.core.folder_analyzer import FolderAnalyzer, analyze_folder
         from repacku.core.zip_compressor import ZipCompressor
         
-        return {
-            'FolderAnalyzer': FolderAnalyzer,
-            'analyze_folder': analyze_folder,
-            'ZipCompressor': ZipCompressor
-        }
+        RepackuAdapter._cached_module = _RepackuModule(
+            FolderAnalyzer=FolderAnalyzer,
+            analyze_folder=analyze_folder,
+            ZipCompressor=ZipCompressor,
+        )
+        return RepackuAdapter._cached_module
     
     async def execute(
         self,
@@ -110,15 +108,8 @@ class RepackuAdapter(BaseAdapter):
         - compress: 根据配置文件执行压缩
         - full: 分析 + 压缩（默认）
         """
-        action = input_data.action.lower()
-        
-        if action == "analyze":
-            return await self._analyze(input_data, on_progress, on_log)
-        elif action == "compress":
-            return await self._compress(input_data, on_progress, on_log)
-        else:
-            # full 模式：先分析再压缩
-            return await self._full(input_data, on_progress, on_log)
+        handler = self._ACTIONS.get(input_data.action.lower(), "_full")
+        return await getattr(self, handler)(input_data, on_progress, on_log)
     
     async def _analyze(
         self,
@@ -139,13 +130,16 @@ class RepackuAdapter(BaseAdapter):
                 message=f"路径格式错误: {str(e)}"
             )
         
-        if not path.exists():
+        # 单次 stat 同时判断存在性和目录类型
+        try:
+            is_dir = stat.S_ISDIR(path.stat().st_mode)
+        except OSError:
             return RepackuOutput(
                 success=False,
                 message=f"路径不存在: {input_data.path}"
             )
         
-        if not path.is_dir():
+        if not is_dir:
             return RepackuOutput(
                 success=False,
                 message=f"路径不是目录: {input_data.path}"
@@ -153,7 +147,7 @@ class RepackuAdapter(BaseAdapter):
         
         try:
             module = self.get_module()
-            FolderAnalyzer = module['FolderAnalyzer']
+            FolderAnalyzer = module.FolderAnalyzer
             
             if on_log:
                 on_log(f"开始分析目录: {input_data.path}")
@@ -169,8 +163,11 @@ class RepackuAdapter(BaseAdapter):
             if on_progress:
                 on_progress(30, "正在扫描文件类型...")
             
-            # 分析文件夹结构
-            root_info = analyzer.analyze_folder_structure(path, target_file_types=target_types)
+            # 分析文件夹结构（扫描与压缩都是阻塞操作，放到线程中执行，避免阻塞事件循环）
+            root_info = await asyncio.to_thread(
+                analyzer.analyze_folder_structure,
+                path, target_file_types=target_types
+            )
             
             if root_info is None:
                 return RepackuOutput(
@@ -182,7 +179,8 @@ class RepackuAdapter(BaseAdapter):
                 on_progress(70, "正在生成配置文件...")
             
             # 生成配置文件
-            config_path = analyzer.generate_config_json(
+            config_path = await asyncio.to_thread(
+                analyzer.generate_config_json,
                 path,
                 output_path=None,
                 target_file_types=target_types,
@@ -192,6 +190,9 @@ class RepackuAdapter(BaseAdapter):
             # 统计压缩模式
             stats = self._count_compress_modes(root_info)
             
+            # 目录树只在需要显示时生成一次，输出字段与 data 共用同一份
+            folder_tree = root_info.to_tree_dict() if input_data.display_tree else None
+            
             if on_progress:
                 on_progress(100, "分析完成")
             
@@ -207,7 +208,7 @@ class RepackuAdapter(BaseAdapter):
                 entire_count=stats['entire'],
                 selective_count=stats['selective'],
                 skip_count=stats['skip'],
-                folder_tree=root_info.to_tree_dict() if root_info else None,
+                folder_tree=folder_tree,
                 output_path=input_data.path,
                 # 把数据也放到 data 字段，供前端使用
                 data={
@@ -216,7 +217,7 @@ class RepackuAdapter(BaseAdapter):
                     'entire_count': stats['entire'],
                     'selective_count': stats['selective'],
                     'skip_count': stats['skip'],
-                    'folder_tree': root_info.to_tree_dict() if root_info else None
+                    'folder_tree': folder_tree
                 }
             )
             
@@ -254,7 +255,12 @@ class RepackuAdapter(BaseAdapter):
         """阶段2：根据配置文件执行压缩"""
         config_path = Path(input_data.config_path)
         
-        if not config_path.exists():
+        try:
+            is_file = stat.S_ISREG(config_path.stat().st_mode)
+        except OSError:
+            is_file = False
+        
+        if not is_file:
             return RepackuOutput(
                 success=False,
                 message=f"配置文件不存在: {input_data.config_path}"
@@ -262,7 +268,7 @@ class RepackuAdapter(BaseAdapter):
         
         try:
             module = self.get_module()
-            ZipCompressor = module['ZipCompressor']
+            ZipCompressor = module.ZipCompressor
             
             if on_log:
                 on_log(f"开始压缩，配置文件: {input_data.config_path}")
@@ -280,7 +286,8 @@ class RepackuAdapter(BaseAdapter):
                     on_progress(adjusted_percent, msg)
             
             # 执行压缩
-            results = compressor.compress_from_json(
+            results = await asyncio.to_thread(
+                compressor.compress_from_json,
                 config_path,
                 delete_after_success=input_data.delete_after,
                 on_progress=progress_wrapper
@@ -342,6 +349,31 @@ class RepackuAdapter(BaseAdapter):
         if not analyze_result.success:
             return analyze_result
         
+        # 没有需要压缩的文件夹时跳过压缩阶段
+        if analyze_result.entire_count + analyze_result.selective_count == 0:
+            if on_progress:
+                on_progress(100, "无需压缩")
+            if on_log:
+                on_log("没有需要压缩的文件夹，跳过压缩")
+            return RepackuOutput(
+                success=True,
+                message="无需压缩",
+                config_path=analyze_result.config_path,
+                compressed_count=0,
+                failed_count=0,
+                total_folders=0,
+                entire_count=0,
+                selective_count=0,
+                skip_count=analyze_result.skip_count,
+                folder_tree=analyze_result.folder_tree,
+                stats={'success': 0, 'failed': 0, 'total': 0},
+                data={
+                    'compressed_count': 0,
+                    'failed_count': 0,
+                    'total_folders': 0
+                }
+            )
+        
         # 再压缩
         input_data.config_path = analyze_result.config_path
         compress_result = await self._compress(input_data, on_progress, on_log)
@@ -355,24 +387,24 @@ class RepackuAdapter(BaseAdapter):
         return compress_result
     
     def _count_compress_modes(self, folder_info) -> Dict[str, int]:
-        """递归统计压缩模式"""
-        stats = {'entire': 0, 'selective': 0, 'skip': 0, 'total': 0}
-        
-        def count(info):
+        """统计压缩模式（显式栈遍历，避免深层目录树触发递归上限）"""
+        modes = []
+        stack = deque([folder_info])
+        while stack:
+            info = stack.pop()
             if info is None:
-                return
-            
-            stats['total'] += 1
-            mode = info.compress_mode or 'skip'
-            if mode == 'entire':
-                stats['entire'] += 1
-            elif mode == 'selective':
-                stats['selective'] += 1
-            else:
-                stats['skip'] += 1
-            
-            for child in info.children:
-                count(child)
+                continue
+            modes.append(info.compress_mode or 'skip')
+            stack.extend(info.children)
         
-        count(folder_info)
-        return stats
+        counts = Counter(modes)
+        total = len(modes)
+        entire = counts['entire']
+        selective = counts['selective']
+        # 除 entire/selective 之外的模式都按跳过计
+        return {
+            'entire': entire,
+            'selective': selective,
+            'skip': total - entire - selective,
+            'total': total,
+        }
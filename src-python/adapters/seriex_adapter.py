@@ -5,15 +5,33 @@ seriex 适配器
 直接调用 seriex 源码的核心函数
 """
 
+import asyncio
+import os
 import sys
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
 from pydantic import BaseModel, Field
 
 from .base import BaseAdapter, AdapterOutput
 
 
+# seriex 源码路径，导入时加入 sys.path
+_SERIEX_SRC = str(Path(__file__).parent.parent.parent.parent / "ImageAll" / "MangaClassify" / "ArtistPreview" / "src")
+_seriex_src_inserted = False
+
+
+def _count_plan(plan: Dict[str, Dict[str, List[str]]]) -> Tuple[int, int]:
+    """单次遍历统计计划/结果中的系列数和文件数"""
+    total_series = 0
+    total_files = 0
+    for groups in plan.values():
+        total_series += len(groups)
+        for files in groups.values():
+            total_files += len(files)
+    return total_series, total_files
+
+
 class SeriexInput(BaseModel):
     """seriex 输入参数"""
     action: str = Field(default="plan", description="操作类型: plan, execute, apply")
@@ -54,6 +72,20 @@ class SeriexAdapter(BaseAdapter):
     input_schema = SeriexInput
     output_schema = SeriexOutput
     
+    # 计划明细日志每批合并的最大行数
+    LOG_BATCH_LINES = 64
+    
+    # action -> 处理方法名；未列出的操作直接返回错误
+    _ACTIONS = {
+        "plan": "_prepare_plan",
+        "execute": "_execute_plan",
+        "apply": "_apply_plan",
+    }
+    
+    # 按配置缓存的提取器实例及其数量上限
+    _extractor_cache: Dict[tuple, Any] = {}
+    EXTRACTOR_CACHE_SIZE = 8
+    
     _extractor_class = None
     
     def _import_module(self) -> type:
@@ -61,10 +93,12 @@ class SeriexAdapter(BaseAdapter):
         if SeriexAdapter._extractor_class is not None:
             return SeriexAdapter._extractor_class
         
-        # 添加源码路径
-        seriex_src = Path(__file__).parent.parent.parent.parent / "ImageAll" / "MangaClassify" / "ArtistPreview" / "src"
-        if str(seriex_src) not in sys.path:
-            sys.path.insert(0, str(seriex_src))
+        # 添加源码路径（每个进程只插入一次）
+        global _seriex_src_inserted
+        if not _seriex_src_inserted:
+            if _SERIEX_SRC not in sys.path:
+                sys.path.insert(0, _SERIEX_SRC)
+            _seriex_src_inserted = True
         
         try:
             from seriex.extractor import SeriesExtractor
@@ -73,8 +107,40 @@ class SeriexAdapter(BaseAdapter):
         except Exception as e:
             raise ImportError(f"无法导入 seriex 模块: {e}")
     
+    @staticmethod
+    def _extractor_key(input_data: SeriexInput) -> tuple:
+        """决定提取器配置的全部输入参数"""
+        return (
+            input_data.threshold,
+            input_data.ratio_threshold,
+            input_data.partial_threshold,
+            input_data.token_threshold,
+            input_data.length_diff_max,
+            input_data.add_prefix,
+            input_data.prefix,
+            tuple(input_data.known_series_dirs),
+        )
+    
     def _create_extractor(self, input_data: SeriexInput):
-        """创建提取器实例"""
+        """
+        获取提取器实例
+        
+        相同配置的提取器会被缓存复用；取出期间从缓存中移除，
+        避免并发请求共用同一个有状态的实例，用完后由 _release_extractor 放回。
+        复用时清掉上次请求留下的状态，并重新加载已知系列目录（其中可能新建了系列文件夹）
+        """
+        key = self._extractor_key(input_data)
+        extractor = SeriexAdapter._extractor_cache.pop(key, None)
+        if extractor is not None:
+            reset_state = getattr(extractor, 'reset_state', None)
+            if reset_state is not None:
+                reset_state()
+            if hasattr(extractor, 'last_summary'):
+                extractor.last_summary = {}
+            if input_data.known_series_dirs:
+                extractor.reload_known_series_dirs(input_data.known_series_dirs)
+            return extractor
+        
         SeriesExtractor = self._import_module()
         
         # 构建相似度配置
@@ -102,6 +168,13 @@ class SeriexAdapter(BaseAdapter):
         
         return extractor
     
+    def _release_extractor(self, input_data: SeriexInput, extractor) -> None:
+        """操作成功完成后把提取器放回缓存，超出容量时淘汰最早放入的"""
+        cache = SeriexAdapter._extractor_cache
+        cache[self._extractor_key(input_data)] = extractor
+        while len(cache) > self.EXTRACTOR_CACHE_SIZE:
+            del cache[next(iter(cache))]
+    
     async def execute(
         self,
         input_data: SeriexInput,
@@ -109,16 +182,10 @@ class SeriexAdapter(BaseAdapter):
         on_log: Optional[Callable[[str], None]] = None
     ) -> SeriexOutput:
         """执行 seriex 操作"""
-        action = input_data.action
-        
-        if action == "plan":
-            return await self._prepare_plan(input_data, on_progress, on_log)
-        elif action == "execute":
-            return await self._execute_plan(input_data, on_progress, on_log)
-        elif action == "apply":
-            return await self._apply_plan(input_data, on_progress, on_log)
-        else:
-            return SeriexOutput(success=False, message=f"未知操作: {action}")
+        handler = self._ACTIONS.get(input_data.action)
+        if handler is None:
+            return SeriexOutput(success=False, message=f"未知操作: {input_data.action}")
+        return await getattr(self, handler)(input_data, on_progress, on_log)
     
     async def _prepare_plan(
         self,
@@ -132,7 +199,6 @@ class SeriexAdapter(BaseAdapter):
         if not directory_path:
             return SeriexOutput(success=False, message="请输入目录路径")
         
-        import os
         if not os.path.isdir(directory_path):
             return SeriexOutput(success=False, message=f"目录不存在: {directory_path}")
         
@@ -151,28 +217,31 @@ class SeriexAdapter(BaseAdapter):
             if on_log:
                 on_log("🔍 开始分析文件...")
             
-            # 调用源码的 prepare_directory 方法
-            plan = extractor.prepare_directory(directory_path)
+            # 调用源码的 prepare_directory 方法（阻塞扫描放到线程中执行）
+            plan = await asyncio.to_thread(extractor.prepare_directory, directory_path)
+            self._release_extractor(input_data, extractor)
             
             if on_progress:
                 on_progress(100, "计划生成完成")
             
             # 统计
-            total_series = sum(len(groups) for groups in plan.values())
-            total_files = sum(
-                len(files) 
-                for groups in plan.values() 
-                for files in groups.values()
-            )
+            total_series, total_files = _count_plan(plan)
             
             if on_log:
                 if plan:
                     on_log(f"✅ 计划生成完成")
                     on_log(f"📊 找到 {total_series} 个系列，共 {total_files} 个文件")
+                    # 计划明细按批合并成多行再输出，减少回调（及前端推送）次数
+                    lines = []
                     for dir_path, groups in plan.items():
-                        on_log(f"📁 {os.path.basename(dir_path)}:")
+                        lines.append(f"📁 {os.path.basename(dir_path)}:")
                         for folder, files in groups.items():
-                            on_log(f"  └─ {folder}: {len(files)} 个文件")
+                            lines.append(f"  └─ {folder}: {len(files)} 个文件")
+                        if len(lines) >= self.LOG_BATCH_LINES:
+                            on_log("\n".join(lines))
+                            lines.clear()
+                    if lines:
+                        on_log("\n".join(lines))
                 else:
                     on_log("ℹ️ 没有找到可提取的系列")
             
@@ -219,9 +288,10 @@ class SeriexAdapter(BaseAdapter):
                 on_progress(20, "生成计划...")
             
             # 先生成计划
-            plan = extractor.prepare_directory(directory_path)
+            plan = await asyncio.to_thread(extractor.prepare_directory, directory_path)
             
             if not plan:
+                self._release_extractor(input_data, extractor)
                 if on_log:
                     on_log("ℹ️ 没有可执行的计划")
                 return SeriexOutput(
@@ -238,18 +308,14 @@ class SeriexAdapter(BaseAdapter):
                 on_log("🚀 开始执行移动...")
             
             # 执行计划
-            summary = extractor.apply_prepared_plan(directory_path)
+            summary = await asyncio.to_thread(extractor.apply_prepared_plan, directory_path)
+            self._release_extractor(input_data, extractor)
             
             if on_progress:
                 on_progress(100, "执行完成")
             
             # 统计
-            total_series = sum(len(groups) for groups in summary.values())
-            total_files = sum(
-                len(files) 
-                for groups in summary.values() 
-                for files in groups.values()
-            )
+            total_series, total_files = _count_plan(summary)
             
             if on_log:
                 on_log(f"✅ 执行完成")
@@ -300,20 +366,16 @@ class SeriexAdapter(BaseAdapter):
                 on_progress(30, "处理中...")
             
             # 调用源码的 process_directory 方法
-            success = extractor.process_directory(directory_path)
+            success = await asyncio.to_thread(extractor.process_directory, directory_path)
             
             if on_progress:
                 on_progress(100, "处理完成")
             
             summary = extractor.last_summary
+            self._release_extractor(input_data, extractor)
             
             # 统计
-            total_series = sum(len(groups) for groups in summary.values())
-            total_files = sum(
-                len(files) 
-                for groups in summary.values() 
-                for files in groups.values()
-            )
+            total_series, total_files = _count_plan(summary)
             
             if on_log:
                 if success:
@@ -10,18 +10,120 @@ sleept 适配器
 - 支持休眠、关机、重启三种电源操作
 """
 
-import os
+import contextlib
+import subprocess
 import sys
+import math
 import time
 import asyncio
 from datetime import datetime, timedelta
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 from pydantic import BaseModel, Field
 
 from .base import BaseAdapter, AdapterOutput
 
 
+# 运行平台在进程内不会变化，导入时确定一次
+_PLATFORM = "win32" if sys.platform == "win32" else "darwin" if sys.platform == "darwin" else "linux"
+
+# 平台 -> 电源操作 -> 命令参数
+_POWER_CMDS: Dict[str, Dict[str, List[str]]] = {
+    "win32": {
+        "sleep": ["rundll32.exe", "powrprof.dll,SetSuspendState", "0,1,0"],
+        "shutdown": ["shutdown", "/s", "/t", "1"],
+        "restart": ["shutdown", "/r", "/t", "1"],
+    },
+    "darwin": {
+        "sleep": ["pmset", "sleepnow"],
+        "shutdown": ["osascript", "-e", 'tell app "System Events" to shut down'],
+        "restart": ["osascript", "-e", 'tell app "System Events" to restart'],
+    },
+    "linux": {
+        "sleep": ["systemctl", "suspend"],
+        "shutdown": ["systemctl", "poweroff"],
+        "restart": ["systemctl", "reboot"],
+    },
+}
+
+
+def _make_power_launcher(platform: str) -> Callable[[str], bool]:
+    """
+    生成只含指定平台命令的电源操作启动函数，返回值表示是否有对应命令
+    
+    命令以脱离的子进程启动：不等待其结束，关机信号到来前结果即可返回
+    """
+    commands = _POWER_CMDS[platform]
+    if platform == "win32":
+        detach_kwargs: Dict[str, Any] = {
+            "creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP,
+        }
+    else:
+        detach_kwargs = {"start_new_session": True}
+    
+    def launch(power_mode: str) -> bool:
+        args = commands.get(power_mode)
+        if args is None:
+            return False
+        subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            **detach_kwargs
+        )
+        return True
+    
+    return launch
+
+
+# 导入时按当前平台生成一次，调用时无需再查平台
+_launch_power = _make_power_launcher(_PLATFORM)
+
+
+class _PreciseTicker:
+    """
+    监控循环的周期唤醒器
+    
+    下次唤醒时刻按上次的计划时刻累加（落后时从当前时刻重新起算），
+    由事件循环的 call_at 在该绝对时刻唤醒，不累积每轮处理耗时造成的漂移；
+    等待期间收到取消立即返回
+    """
+    
+    def __init__(self, cancel_event: asyncio.Event):
+        self._loop = asyncio.get_running_loop()
+        self._next = self._loop.time()
+        self._cancelled = self._loop.create_task(cancel_event.wait())
+    
+    async def sleep(self, interval: float) -> bool:
+        """等到下一个唤醒时刻，被取消时返回 True"""
+        loop = self._loop
+        self._next = max(self._next + interval, loop.time())
+        waiter = loop.create_future()
+        handle = loop.call_at(self._next, waiter.set_result, None)
+        try:
+            await asyncio.wait((waiter, self._cancelled), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            handle.cancel()
+            if not waiter.done():
+                waiter.cancel()
+        return self._cancelled.done()
+    
+    def close(self) -> None:
+        """停止等待取消事件"""
+        self._cancelled.cancel()
+
+
+class _MonitorMessages(NamedTuple):
+    """监控循环的提示文本模板，位置参数为 sample() 返回的显示用数值"""
+    low_start: str
+    low_progress: str
+    recovered: str
+    watching: str
+    reached: str
+
+
 class SleeptInput(BaseModel):
     """sleept 输入参数"""
     action: str = Field(default="status", description="操作类型: status, countdown, specific_time, netspeed, cpu, cancel, get_stats")
@@ -77,11 +179,113 @@ class SleeptAdapter(BaseAdapter):
     input_schema = SleeptInput
     output_schema = SleeptOutput
     
+    # 电源操作的显示名称
+    _ACTION_TEXT = {"sleep": "休眠", "shutdown": "关机", "restart": "重启"}
+    
+    # 监控模式远离阈值时的最长采样间隔（秒）
+    MAX_POLL_INTERVAL = 10.0
+    
+    # 监控模式的最长等待时间（秒）
+    MAX_MONITOR_SECONDS = 3600
+    
+    # 网速监控中下载方向不参与判定时，显示值的最长刷新间隔（采样轮数）
+    DOWN_DISPLAY_TICKS = 5
+    
+    # 高于阈值时"监控中"进度的最短上报间隔（秒），越过阈值时立即上报
+    WATCHING_PROGRESS_INTERVAL = 5.0
+    
+    # get_stats 可直接复用的网络采样的最长时效（秒）
+    STATS_SAMPLE_MAX_AGE = 5.0
+    
+    def __init__(self):
+        super().__init__()
+        # 正在运行的定时任务各自的取消事件（在所属事件循环内创建）
+        self._cancel_events: Set[asyncio.Event] = set()
+        # 最近一次网络计数采样 (monotonic 时间, net_io_counters 结果)，供 get_stats 求差
+        self._net_sample: Optional[Tuple[float, Any]] = None
+        # 最近一次 CPU 使用率采样 (monotonic 时间, 使用率)
+        self._cpu_sample: Optional[Tuple[float, float]] = None
+        # psutil 采样入口（绑定方法），首次需要时由 _ensure_psutil 填充
+        self._net_io_counters: Optional[Callable[[], Any]] = None
+        self._cpu_percent: Optional[Callable[..., float]] = None
+        # 预热 CPU 计数，之后的 interval=None 查询都有基准，无需阻塞采样
+        try:
+            self._ensure_psutil()
+            self._cpu_percent(interval=None)
+        except ImportError:
+            pass
+    
+    @contextlib.contextmanager
+    def _cancellable(self) -> Iterator[asyncio.Event]:
+        """登记一个取消事件，定时结束后自动注销"""
+        event = asyncio.Event()
+        self._cancel_events.add(event)
+        try:
+            yield event
+        finally:
+            self._cancel_events.discard(event)
+    
+    def cancel(self) -> int:
+        """取消所有正在运行的定时/监控，等待中的任务会立即返回，返回被取消的数量"""
+        events = list(self._cancel_events)
+        for event in events:
+            event.set()
+        return len(events)
+    
     def _import_module(self) -> Dict:
         """懒加载导入模块"""
         import psutil
         return {"psutil": psutil}
     
+    def _ensure_psutil(self) -> None:
+        """首次使用时导入 psutil 并缓存采样入口，之后直接调用绑定方法"""
+        if self._cpu_percent is None:
+            psutil = self.get_module()["psutil"]
+            self._net_io_counters = psutil.net_io_counters
+            self._cpu_percent = psutil.cpu_percent
+    
+    def _cpu_usage(self) -> float:
+        """
+        非阻塞读取 CPU 使用率，1 秒内的重复查询直接返回上次的值
+        
+        interval=None 返回距上次调用（__init__ 中已预热）以来的使用率
+        """
+        now = time.monotonic()
+        sample = self._cpu_sample
+        if sample is not None and now - sample[0] < 1.0:
+            return sample[1]
+        self._ensure_psutil()
+        value = self._cpu_percent(interval=None)
+        self._cpu_sample = (now, value)
+        return value
+    
+    @classmethod
+    def _poll_interval(cls, margin: float, duration_seconds: float) -> float:
+        """
+        监控的下一次采样间隔
+        
+        margin 为当前值高于阈值的幅度：远高于阈值时逐步放宽间隔（最长 MAX_POLL_INTERVAL，
+        且不超过持续时间的 1/20），接近或低于阈值时回到 1 秒，保证触发时刻准确
+        """
+        if margin <= 0:
+            return 1.0
+        return max(1.0, min(margin * 0.5, cls.MAX_POLL_INTERVAL, duration_seconds / 20))
+    
+    @staticmethod
+    def _cancelled_output(
+        remaining: float,
+        on_log: Optional[Callable[[str], None]] = None
+    ) -> SleeptOutput:
+        """定时被取消时的结果"""
+        if on_log:
+            on_log("🛑 定时已取消")
+        return SleeptOutput(
+            success=False,
+            message="定时已取消",
+            timer_status="cancelled",
+            remaining_seconds=math.ceil(remaining)
+        )
+    
     async def execute(
         self,
         input_data: SleeptInput,
@@ -103,6 +307,13 @@ class SleeptAdapter(BaseAdapter):
             return await self._run_cpu_monitor(input_data, on_progress, on_log)
         elif action == "get_stats":
             return await self._get_stats(on_log)
+        elif action == "cancel":
+            cancelled = self.cancel()
+            return SleeptOutput(
+                success=True,
+                message=f"已取消 {cancelled} 个定时任务" if cancelled else "没有正在运行的定时任务",
+                timer_status="cancelled" if cancelled else "idle"
+            )
         else:
             return SleeptOutput(
                 success=False,
@@ -116,8 +327,7 @@ class SleeptAdapter(BaseAdapter):
         current_download = 0
         
         try:
-            psutil = self.get_module()["psutil"]
-            current_cpu = psutil.cpu_percent(interval=0.1)
+            current_cpu = self._cpu_usage()
         except:
             pass
         
@@ -130,6 +340,139 @@ class SleeptAdapter(BaseAdapter):
             current_download=current_download
         )
     
+    async def _wait_deadline(
+        self,
+        total_seconds: float,
+        on_progress: Optional[Callable[[int, str], None]] = None
+    ) -> Optional[float]:
+        """
+        倒计时等待 total_seconds 秒，到点返回 None，被取消时返回剩余秒数
+        
+        截止时间由事件循环的定时器在绝对时刻唤醒一次，不累积 sleep 误差；
+        进度更新按固定周期（约 100 次）排在绝对时刻上，没有进度回调时不安排
+        """
+        with self._cancellable() as cancel_event:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            deadline = start + total_seconds
+            done = loop.create_future()
+            handles = [loop.call_at(deadline, done.set_result, None)]
+            
+            if on_progress:
+                tick_period = max(1.0, total_seconds / 100)
+                
+                def tick(n: int) -> None:
+                    remaining = deadline - loop.time()
+                    if done.done() or remaining <= 0:
+                        return
+                    hours, remainder = divmod(math.ceil(remaining), 3600)
+                    minutes, seconds = divmod(remainder, 60)
+                    on_progress(
+                        int((total_seconds - remaining) * 100 // total_seconds),
+                        f"剩余 {hours:02d}:{minutes:02d}:{seconds:02d}"
+                    )
+                    handles.append(loop.call_at(start + (n + 1) * tick_period, tick, n + 1))
+                
+                tick(0)
+            
+            cancelled = loop.create_task(cancel_event.wait())
+            try:
+                await asyncio.wait((done, cancelled), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for handle in handles:
+                    handle.cancel()
+                cancelled.cancel()
+            
+            if done.done():
+                return None
+            done.cancel()
+            return max(0.0, deadline - loop.time())
+    
+    async def _monitor(
+        self,
+        sample: Callable[[], Tuple[bool, float, tuple]],
+        duration_seconds: float,
+        messages: _MonitorMessages,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+        on_log: Optional[Callable[[str], None]] = None
+    ) -> Tuple[str, tuple]:
+        """
+        监控循环，网速与 CPU 监控共用
+        
+        sample() 返回 (是否低于阈值, 高于阈值的幅度, 显示用数值)。
+        连续低于阈值达到 duration_seconds 时返回 ("completed", 数值)，
+        被取消返回 ("cancelled", 数值)，超过 MAX_MONITOR_SECONDS 返回 ("timeout", 数值)
+        """
+        monotonic = time.monotonic
+        low_start = None
+        elapsed_total = 0
+        poll_interval = 1.0
+        last_watching = None
+        values: tuple = ()
+        
+        with self._cancellable() as cancel_event:
+            ticker = _PreciseTicker(cancel_event)
+            try:
+                while elapsed_total < self.MAX_MONITOR_SECONDS:
+                    if await ticker.sleep(poll_interval):
+                        return "cancelled", values
+                    elapsed_total += poll_interval
+                    
+                    trigger, margin, values = sample()
+                    now_time = monotonic()
+                    poll_interval = self._poll_interval(margin, duration_seconds)
+                    
+                    if trigger:
+                        if low_start is None:
+                            low_start = now_time
+                            if on_log:
+                                on_log(messages.low_start.format(*values))
+                        
+                        elapsed = now_time - low_start
+                        
+                        if on_progress:
+                            on_progress(
+                                min(99, int(elapsed / duration_seconds * 100)),
+                                messages.low_progress.format(*values, elapsed=int(elapsed), duration=int(duration_seconds))
+                            )
+                        
+                        if elapsed >= duration_seconds:
+                            if on_log:
+                                on_log(messages.reached)
+                            
+                            if on_progress:
+                                on_progress(100, "触发条件达成！")
+                            
+                            return "completed", values
+                    else:
+                        crossed = low_start is not None
+                        if crossed:
+                            if on_log:
+                                on_log(messages.recovered.format(*values))
+                            low_start = None
+                        
+                        # 高于阈值期间只按间隔上报，减少无变化的消息
+                        if on_progress and (
+                            crossed
+                            or last_watching is None
+                            or now_time - last_watching >= self.WATCHING_PROGRESS_INTERVAL
+                        ):
+                            last_watching = now_time
+                            on_progress(0, messages.watching.format(*values))
+            finally:
+                ticker.close()
+        
+        return "timeout", values
+    
+    @staticmethod
+    def _monitor_timeout_output() -> SleeptOutput:
+        """监控超时未触发时的结果"""
+        return SleeptOutput(
+            success=False,
+            message="监控超时（1小时），未触发条件",
+            timer_status="cancelled"
+        )
+    
     async def _run_countdown(
         self,
         input_data: SleeptInput,
@@ -151,20 +494,9 @@ class SleeptAdapter(BaseAdapter):
         
         target_time = datetime.now() + timedelta(seconds=total_seconds)
         
-        # 同步倒计时循环
-        remaining = total_seconds
-        while remaining > 0:
-            hours, remainder = divmod(remaining, 3600)
-            minutes, seconds = divmod(remainder, 60)
-            progress = int((1 - remaining / total_seconds) * 100)
-            time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            
-            if on_progress:
-                on_progress(progress, f"剩余 {time_str}")
-            
-            # 使用 asyncio.sleep 让出控制权
-            await asyncio.sleep(1)
-            remaining -= 1
+        remaining = await self._wait_deadline(total_seconds, on_progress)
+        if remaining is not None:
+            return self._cancelled_output(remaining, on_log)
         
         # 倒计时结束
         if on_progress:
@@ -174,7 +506,7 @@ class SleeptAdapter(BaseAdapter):
             on_log("⏰ 倒计时结束")
         
         # 执行电源操作
-        self._execute_power_action(power_mode, dryrun, on_log)
+        await self._execute_power_action(power_mode, dryrun, on_log)
         
         return SleeptOutput(
             success=True,
@@ -203,7 +535,7 @@ class SleeptAdapter(BaseAdapter):
         if target <= now:
             return SleeptOutput(success=False, message="目标时间必须在当前时间之后")
         
-        total_seconds = int((target - now).total_seconds())
+        total_seconds = (target - now).total_seconds()
         power_mode = input_data.power_mode
         dryrun = input_data.dryrun
         
@@ -211,19 +543,9 @@ class SleeptAdapter(BaseAdapter):
             on_log(f"📅 定时到 {input_data.target_datetime}")
             on_log(f"⚡ 电源操作: {power_mode}, dryrun: {dryrun}")
         
-        # 同步倒计时循环
-        remaining = total_seconds
-        while remaining > 0:
-            hours, remainder = divmod(remaining, 3600)
-            minutes, seconds = divmod(remainder, 60)
-            progress = int((1 - remaining / total_seconds) * 100)
-            time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            
-            if on_progress:
-                on_progress(progress, f"剩余 {time_str}")
-            
-            await asyncio.sleep(1)
-            remaining -= 1
+        remaining = await self._wait_deadline(total_seconds, on_progress)
+        if remaining is not None:
+            return self._cancelled_output(remaining, on_log)
         
         if on_progress:
             on_progress(100, "时间到！")
@@ -231,7 +553,7 @@ class SleeptAdapter(BaseAdapter):
         if on_log:
             on_log("⏰ 到达指定时间")
         
-        self._execute_power_action(power_mode, dryrun, on_log)
+        await self._execute_power_action(power_mode, dryrun, on_log)
         
         return SleeptOutput(
             success=True,
@@ -248,86 +570,101 @@ class SleeptAdapter(BaseAdapter):
         on_log: Optional[Callable[[str], None]] = None
     ) -> SleeptOutput:
         """运行网速监控模式"""
-        psutil = self.get_module()["psutil"]
+        self._ensure_psutil()
         
         power_mode = input_data.power_mode
         dryrun = input_data.dryrun
-        duration_seconds = input_data.net_duration * 60
+        upload_threshold = input_data.upload_threshold
+        download_threshold = input_data.download_threshold
+        both = input_data.net_trigger_mode == "both"
         
         if on_log:
-            on_log(f"📡 网速监控启动 - 上传阈值: {input_data.upload_threshold}KB/s, 下载阈值: {input_data.download_threshold}KB/s")
+            on_log(f"📡 网速监控启动 - 上传阈值: {upload_threshold}KB/s, 下载阈值: {download_threshold}KB/s")
             on_log(f"⏱️ 持续时间: {input_data.net_duration}分钟, 触发模式: {input_data.net_trigger_mode}")
         
-        last = psutil.net_io_counters()
-        last_time = time.time()
-        low_start = None
-        max_wait = 3600  # 最多等待1小时
-        elapsed_total = 0
-        
-        while elapsed_total < max_wait:
-            await asyncio.sleep(1)
-            elapsed_total += 1
-            
-            now = psutil.net_io_counters()
-            now_time = time.time()
-            interval = now_time - last_time
-            
-            up_speed = (now.bytes_sent - last.bytes_sent) / interval / 1024
-            down_speed = (now.bytes_recv - last.bytes_recv) / interval / 1024
+        # 循环外绑定采样函数；同一轮顺带读取 CPU（interval=None 不阻塞，先预热一次）。
+        # 计时使用整数纳秒的 monotonic 时钟，不受系统时间调整影响
+        net_io = self._net_io_counters
+        cpu_percent = self._cpu_percent
+        monotonic_ns = time.monotonic_ns
+        cpu_percent(interval=None)
+        
+        # 阈值预先换算为整数字节/秒，判定时与纳秒间隔做整数比较
+        up_thr_b = int(upload_threshold * 1024)
+        down_thr_b = int(download_threshold * 1024)
+        
+        last = net_io()
+        last_ns = monotonic_ns()
+        # 下载方向不参与判定时沿用的显示值，每 DOWN_DISPLAY_TICKS 轮至少刷新一次
+        down_speed = 0.0
+        down_age = self.DOWN_DISPLAY_TICKS
+        
+        def sample() -> Tuple[bool, float, tuple]:
+            nonlocal last, last_ns, down_speed, down_age
+            now = net_io()
+            cpu = cpu_percent(interval=None)
+            now_ns = monotonic_ns()
+            self._net_sample = (now_ns / 1_000_000_000, now)
+            # 两次采样落在同一时钟刻度时按 1ns 计，避免除零
+            dt_ns = (now_ns - last_ns) or 1
+            sent = now.bytes_sent - last.bytes_sent
+            prev, last, last_ns = last, now, now_ns
             
-            low_up = up_speed < input_data.upload_threshold
-            low_down = down_speed < input_data.download_threshold
+            # 浮点速度只用于采样间隔的估算和显示，每轮只做一次除法
+            to_kib_per_s = 1_000_000_000 / 1024 / dt_ns
+            up_speed = sent * to_kib_per_s
+            up_margin = up_speed - upload_threshold
             
-            trigger = False
-            if input_data.net_trigger_mode == "both":
-                trigger = low_up and low_down
-            else:
-                trigger = low_up or low_down
+            # 字节数 / 间隔 < 阈值，两边同乘间隔后全用整数比较。
+            # 上传方向已能决定结果时（both 模式未低于阈值、任一模式已低于阈值）不再计算下载方向，
+            # 此时以上传方向的差值作为距离：both 模式取其下界、任一模式本就 <= 0，采样间隔只会偏保守
+            low_up = sent * 1_000_000_000 < up_thr_b * dt_ns
+            decided = low_up != both
+            down_age += 1
+            if decided and down_age < self.DOWN_DISPLAY_TICKS:
+                return low_up, up_margin, (up_speed, down_speed, cpu)
             
-            if trigger:
-                if low_start is None:
-                    low_start = now_time
-                    if on_log:
-                        on_log(f"📉 网速低于阈值 (↑{up_speed:.1f} ↓{down_speed:.1f} KB/s)，开始计时...")
-                
-                elapsed = now_time - low_start
-                progress = min(99, int(elapsed / duration_seconds * 100))
-                
-                if on_progress:
-                    on_progress(progress, f"低速 {int(elapsed)}s/{int(duration_seconds)}s (↑{up_speed:.1f} ↓{down_speed:.1f})")
-                
-                if elapsed >= duration_seconds:
-                    if on_log:
-                        on_log(f"⏰ 网速低于阈值已持续 {input_data.net_duration} 分钟")
-                    
-                    if on_progress:
-                        on_progress(100, "触发条件达成！")
-                    
-                    self._execute_power_action(power_mode, dryrun, on_log)
-                    
-                    return SleeptOutput(
-                        success=True,
-                        message=f"网速监控触发，已执行 {power_mode}" if not dryrun else f"[dryrun] 网速监控触发，模拟执行 {power_mode}",
-                        timer_status="completed",
-                        current_upload=up_speed,
-                        current_download=down_speed
-                    )
-            else:
-                if low_start is not None:
-                    if on_log:
-                        on_log(f"📈 网速恢复 (↑{up_speed:.1f} ↓{down_speed:.1f} KB/s)")
-                    low_start = None
-                
-                if on_progress:
-                    on_progress(0, f"监控中 ↑{up_speed:.1f} ↓{down_speed:.1f} KB/s")
+            recv = now.bytes_recv - prev.bytes_recv
+            down_speed = recv * to_kib_per_s
+            down_age = 0
+            if decided:
+                return low_up, up_margin, (up_speed, down_speed, cpu)
             
-            last = now
-            last_time = now_time
+            low_down = recv * 1_000_000_000 < down_thr_b * dt_ns
+            down_margin = down_speed - download_threshold
+            if both:
+                # 两个方向都需降到阈值以下，离触发的距离取超出最多的一方
+                return low_down, max(up_margin, down_margin), (up_speed, down_speed, cpu)
+            return low_down, min(up_margin, down_margin), (up_speed, down_speed, cpu)
+        
+        status, values = await self._monitor(
+            sample,
+            input_data.net_duration * 60,
+            _MonitorMessages(
+                low_start="📉 网速低于阈值 (↑{0:.1f} ↓{1:.1f} KB/s)，开始计时...",
+                low_progress="低速 {elapsed}s/{duration}s (↑{0:.1f} ↓{1:.1f})",
+                recovered="📈 网速恢复 (↑{0:.1f} ↓{1:.1f} KB/s)",
+                watching="监控中 ↑{0:.1f} ↓{1:.1f} KB/s",
+                reached=f"⏰ 网速低于阈值已持续 {input_data.net_duration} 分钟",
+            ),
+            on_progress,
+            on_log
+        )
+        if status == "cancelled":
+            return self._cancelled_output(0, on_log)
+        if status == "timeout":
+            return self._monitor_timeout_output()
+        
+        await self._execute_power_action(power_mode, dryrun, on_log)
         
+        up_speed, down_speed, cpu = values
         return SleeptOutput(
-            success=False,
-            message="监控超时（1小时），未触发条件",
-            timer_status="cancelled"
+            success=True,
+            message=f"网速监控触发，已执行 {power_mode}" if not dryrun else f"[dryrun] 网速监控触发，模拟执行 {power_mode}",
+            timer_status="completed",
+            current_upload=up_speed,
+            current_download=down_speed,
+            current_cpu=cpu
         )
     
     async def _run_cpu_monitor(
@@ -337,119 +674,103 @@ class SleeptAdapter(BaseAdapter):
         on_log: Optional[Callable[[str], None]] = None
     ) -> SleeptOutput:
         """运行CPU监控模式"""
-        psutil = self.get_module()["psutil"]
+        self._ensure_psutil()
         
         power_mode = input_data.power_mode
         dryrun = input_data.dryrun
-        duration_seconds = input_data.cpu_duration * 60
+        cpu_threshold = input_data.cpu_threshold
         
         if on_log:
-            on_log(f"💻 CPU监控启动 - 阈值: {input_data.cpu_threshold}%, 持续: {input_data.cpu_duration}分钟")
-        
-        low_start = None
-        max_wait = 3600  # 最多等待1小时
-        elapsed_total = 0
+            on_log(f"💻 CPU监控启动 - 阈值: {cpu_threshold}%, 持续: {input_data.cpu_duration}分钟")
+        
+        # 循环外绑定采样函数
+        sample_cpu = self._cpu_percent
+        
+        def sample() -> Tuple[bool, float, tuple]:
+            cpu_percent = sample_cpu(interval=None)
+            return cpu_percent < cpu_threshold, cpu_percent - cpu_threshold, (cpu_percent,)
+        
+        status, values = await self._monitor(
+            sample,
+            input_data.cpu_duration * 60,
+            _MonitorMessages(
+                low_start="📉 CPU {0:.1f}% 低于阈值，开始计时...",
+                low_progress="CPU {0:.1f}% - 低使用率 {elapsed}s/{duration}s",
+                recovered="📈 CPU使用率恢复 ({0:.1f}%)",
+                watching="监控中 CPU {0:.1f}%",
+                reached=f"⏰ CPU低使用率已持续 {input_data.cpu_duration} 分钟",
+            ),
+            on_progress,
+            on_log
+        )
+        if status == "cancelled":
+            return self._cancelled_output(0, on_log)
+        if status == "timeout":
+            return self._monitor_timeout_output()
         
-        while elapsed_total < max_wait:
-            await asyncio.sleep(1)
-            elapsed_total += 1
-            
-            cpu_percent = psutil.cpu_percent(interval=None)
-            now_time = time.time()
-            
-            if cpu_percent < input_data.cpu_threshold:
-                if low_start is None:
-                    low_start = now_time
-                    if on_log:
-                        on_log(f"📉 CPU {cpu_percent:.1f}% 低于阈值，开始计时...")
-                
-                elapsed = now_time - low_start
-                progress = min(99, int(elapsed / duration_seconds * 100))
-                
-                if on_progress:
-                    on_progress(progress, f"CPU {cpu_percent:.1f}% - 低使用率 {int(elapsed)}s/{int(duration_seconds)}s")
-                
-                if elapsed >= duration_seconds:
-                    if on_log:
-                        on_log(f"⏰ CPU低使用率已持续 {input_data.cpu_duration} 分钟")
-                    
-                    if on_progress:
-                        on_progress(100, "触发条件达成！")
-                    
-                    self._execute_power_action(power_mode, dryrun, on_log)
-                    
-                    return SleeptOutput(
-                        success=True,
-                        message=f"CPU监控触发，已执行 {power_mode}" if not dryrun else f"[dryrun] CPU监控触发，模拟执行 {power_mode}",
-                        timer_status="completed",
-                        current_cpu=cpu_percent
-                    )
-            else:
-                if low_start is not None:
-                    if on_log:
-                        on_log(f"📈 CPU使用率恢复 ({cpu_percent:.1f}%)")
-                    low_start = None
-                
-                if on_progress:
-                    on_progress(0, f"监控中 CPU {cpu_percent:.1f}%")
+        await self._execute_power_action(power_mode, dryrun, on_log)
         
         return SleeptOutput(
-            success=False,
-            message="监控超时（1小时），未触发条件",
-            timer_status="cancelled"
+            success=True,
+            message=f"CPU监控触发，已执行 {power_mode}" if not dryrun else f"[dryrun] CPU监控触发，模拟执行 {power_mode}",
+            timer_status="completed",
+            current_cpu=values[0]
         )
     
-    def _execute_power_action(
+    async def _execute_power_action(
         self, 
         power_mode: str, 
         dryrun: bool, 
         on_log: Optional[Callable[[str], None]] = None
     ):
-        """执行电源操作"""
-        action_text = {"sleep": "休眠", "shutdown": "关机", "restart": "重启"}.get(power_mode, power_mode)
+        """执行电源操作（命令以脱离的子进程启动，不等待其结束）"""
+        action_text = self._ACTION_TEXT.get(power_mode, power_mode)
         
         if dryrun:
             if on_log:
                 on_log(f"🔔 [dryrun] 模拟执行: {action_text}")
-            return
-        
-        if on_log:
-            on_log(f"⚡ 执行电源操作: {action_text}")
-        
-        if sys.platform == 'win32':
-            if power_mode == "sleep":
-                os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
-            elif power_mode == "shutdown":
-                os.system("shutdown /s /t 1")
-            elif power_mode == "restart":
-                os.system("shutdown /r /t 1")
-        elif sys.platform == 'darwin':
-            if power_mode == "sleep":
-                os.system("pmset sleepnow")
-            elif power_mode == "shutdown":
-                os.system("osascript -e 'tell app \"System Events\" to shut down'")
-            elif power_mode == "restart":
-                os.system("osascript -e 'tell app \"System Events\" to restart'")
         else:
-            if power_mode == "sleep":
-                os.system("systemctl suspend")
-            elif power_mode == "shutdown":
-                os.system("systemctl poweroff")
-            elif power_mode == "restart":
-                os.system("systemctl reboot")
+            if on_log:
+                on_log(f"⚡ 执行电源操作: {action_text}")
+            
+            try:
+                _launch_power(power_mode)
+            except OSError as e:
+                if on_log:
+                    on_log(f"❌ 电源操作失败: {e}")
+        
+        # 启动命令不会挂起，这里让出一次事件循环，使其他任务（如日志推送）在返回结果前得以运行；
+        # sleep(0) 不创建定时器
+        await asyncio.sleep(0)
     
     async def _get_stats(self, on_log: Optional[Callable[[str], None]] = None) -> SleeptOutput:
         """获取系统状态统计"""
-        psutil = self.get_module()["psutil"]
-        
-        # 获取网速
-        net1 = psutil.net_io_counters()
-        await asyncio.sleep(0.5)
-        net2 = psutil.net_io_counters()
-        
-        up_speed = (net2.bytes_sent - net1.bytes_sent) / 0.5 / 1024
-        down_speed = (net2.bytes_recv - net1.bytes_recv) / 0.5 / 1024
-        cpu = psutil.cpu_percent(interval=0.1)
+        self._ensure_psutil()
+        net_io = self._net_io_counters
+        cpu_percent = self._cpu_percent
+        
+        # 最近 STATS_SAMPLE_MAX_AGE 秒内有网络采样（上次查询或监控循环留下的）时，
+        # 直接与其求差，无需等待采样窗口
+        now_time = time.monotonic()
+        net2 = net_io()
+        last = self._net_sample
+        if last is not None and 0.1 <= now_time - last[0] <= self.STATS_SAMPLE_MAX_AGE:
+            window, net1 = now_time - last[0], last[1]
+            cpu = cpu_percent(interval=None)
+        else:
+            # 没有可用的缓存时采样 0.5 秒：先预热 CPU 计数，
+            # 窗口结束时 interval=None 即得到整个窗口的使用率
+            net1 = net2
+            cpu_percent(interval=None)
+            await asyncio.sleep(0.5)
+            now_time = time.monotonic()
+            net2 = net_io()
+            cpu = cpu_percent(interval=None)
+            window = 0.5
+        self._net_sample = (now_time, net2)
+        
+        up_speed = (net2.bytes_sent - net1.bytes_sent) / window / 1024
+        down_speed = (net2.bytes_recv - net1.bytes_recv) / window / 1024
         
         return SleeptOutput(
             success=True,
@@ -14,6 +14,7 @@ import threading
 import socket
 import subprocess
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from uvicorn import Config, Server
@@ -29,6 +30,7 @@ from api.terminal_ws import router as terminal_router
 from api.files import router as files_router
 from api.backup import router as backup_router
 from api.storage import router as storage_router
+from adapters import close_adapters
 from db.database import init_db
 
 PORT_API = 8009
@@ -85,8 +87,15 @@ RUNNING_MODE = detect_running_mode()
 STANDALONE_MODE = RUNNING_MODE == "standalone"
 mode_label = RUNNING_MODE
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：关闭时让适配器保存未完成的状态（如 marku 批次撤销点）"""
+    yield
+    await close_adapters()
+
+
 # Create FastAPI app
-app = FastAPI(title="Aestivus API", version="1.0.0")
+app = FastAPI(title="Aestivus API", version="1.0.0", lifespan=lifespan)
 
 # CORS 配置 - 允许所有本地来源（开发和生产环境）
 cors_origins = [
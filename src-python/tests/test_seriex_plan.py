@@ -0,0 +1,134 @@
+"""
+seriex 适配器：plan 操作
+
+使用替身 SeriesExtractor 运行 plan 操作，验证：
+- 计划与统计结果正确返回
+- 计划明细日志按 LOG_BATCH_LINES 合并输出
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adapters.seriex_adapter import SeriexAdapter, SeriexInput
+
+
+class FakeExtractor:
+    """模拟 seriex.extractor.SeriesExtractor，记录调用情况"""
+
+    plan = {}
+    instances = 0
+
+    def __init__(self, similarity_config=None, add_prefix=True):
+        FakeExtractor.instances += 1
+        self.config = {}
+        self.known_dirs = []
+
+    def reload_known_series_dirs(self, dirs):
+        self.known_dirs = list(dirs)
+
+    def prepare_directory(self, directory_path):
+        return FakeExtractor.plan
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    """替换提取器类并隔离类级缓存"""
+    monkeypatch.setattr(SeriexAdapter, "_extractor_class", FakeExtractor)
+    monkeypatch.setattr(SeriexAdapter, "_extractor_cache", {})
+    FakeExtractor.instances = 0
+    return SeriexAdapter()
+
+
+def _run_plan(adapter, directory):
+    logs = []
+    result = asyncio.run(adapter.execute(
+        SeriexInput(action="plan", directory_path=str(directory)),
+        on_log=logs.append
+    ))
+    return result, logs
+
+
+def test_plan_returns_plan_and_counts(adapter, tmp_path):
+    """plan 操作返回计划、系列数和文件数"""
+    FakeExtractor.plan = {
+        str(tmp_path / "a"): {"[#s]Foo": ["foo 1.zip", "foo 2.zip"]},
+        str(tmp_path / "b"): {"[#s]Bar": ["bar 1.zip"], "[#s]Baz": ["baz 1.zip", "baz 2.zip"]},
+    }
+
+    result, logs = _run_plan(adapter, tmp_path)
+
+    assert result.success
+    assert result.plan == FakeExtractor.plan
+    assert result.total_series == 3
+    assert result.total_files == 5
+    assert result.data["total_files"] == 5
+    assert "📁 a:\n  └─ [#s]Foo: 2 个文件\n📁 b:" in "\n".join(logs)
+
+
+def test_plan_missing_directory(adapter, tmp_path):
+    """目录不存在时直接返回错误"""
+    result, _ = _run_plan(adapter, tmp_path / "missing")
+
+    assert not result.success
+    assert "目录不存在" in result.message
+
+
+def test_plan_reuses_extractor(adapter, tmp_path):
+    """相同配置的连续请求复用同一个提取器"""
+    FakeExtractor.plan = {}
+
+    _run_plan(adapter, tmp_path)
+    result, logs = _run_plan(adapter, tmp_path)
+
+    assert result.success
+    assert FakeExtractor.instances == 1
+    assert "ℹ️ 没有找到可提取的系列" in logs
+
+
+def test_plan_log_lines_are_batched(adapter, tmp_path, monkeypatch):
+    """计划明细按 LOG_BATCH_LINES 合并，目录块不会被拆开"""
+    monkeypatch.setattr(SeriexAdapter, "LOG_BATCH_LINES", 4)
+    FakeExtractor.plan = {
+        str(tmp_path / f"dir{i}"): {f"[#s]S{i}": [f"s{i} 1.zip"]}
+        for i in range(5)
+    }
+
+    result, logs = _run_plan(adapter, tmp_path)
+
+    assert result.success
+    detail = [entry for entry in logs if entry.startswith("📁")]
+    # 每个目录 2 行，4 行一批：5 个目录合并为 3 次回调
+    assert [entry.count("\n") + 1 for entry in detail] == [4, 4, 2]
+    assert "\n".join(detail).splitlines() == [
+        line
+        for i in range(5)
+        for line in (f"📁 dir{i}:", f"  └─ [#s]S{i}: 1 个文件")
+    ]
+
+
+def test_reused_extractor_is_reset(adapter, tmp_path):
+    """复用的提取器重新加载已知系列目录，并清掉上次的执行结果"""
+    FakeExtractor.plan = {}
+    known = tmp_path / "known"
+    known.mkdir()
+    SeriexAdapter._extractor_cache.clear()
+
+    asyncio.run(adapter.execute(
+        SeriexInput(action="plan", directory_path=str(tmp_path), known_series_dirs=[str(known)])
+    ))
+    (extractor,) = SeriexAdapter._extractor_cache.values()
+    extractor.known_dirs = []
+    extractor.last_summary = {str(tmp_path): {"[#s]Old": ["old.zip"]}}
+
+    asyncio.run(adapter.execute(
+        SeriexInput(action="plan", directory_path=str(tmp_path), known_series_dirs=[str(known)])
+    ))
+
+    assert FakeExtractor.instances == 1
+    assert extractor.known_dirs == [str(known)]
+    assert extractor.last_summary == {}
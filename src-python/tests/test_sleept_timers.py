@@ -0,0 +1,143 @@
+"""
+sleept 适配器：倒计时与监控
+
+- 倒计时的进度消息与完成结果
+- 运行中的定时可被 cancel 取消
+- 网速 / CPU 监控在 psutil 替身下按阈值触发
+"""
+
+import asyncio
+import itertools
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adapters.sleept_adapter import SleeptAdapter, SleeptInput
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    """监控采样间隔缩短到 0.05 秒，避免测试等待过久"""
+    monkeypatch.setattr(SleeptAdapter, "_poll_interval", classmethod(lambda cls, margin, duration: 0.05))
+    return SleeptAdapter()
+
+
+def _fake_psutil(adapter, cpu_values, sent_step=0, recv_step=0):
+    """替换实例上缓存的 psutil 采样入口：CPU 按序列取值，网络计数按固定步长增长"""
+    cpu_iter = itertools.chain(cpu_values, itertools.repeat(cpu_values[-1]))
+    counter = itertools.count()
+
+    def net_io_counters():
+        n = next(counter)
+        return SimpleNamespace(bytes_sent=n * sent_step, bytes_recv=n * recv_step)
+
+    adapter._cpu_percent = lambda interval=None: next(cpu_iter)
+    adapter._net_io_counters = net_io_counters
+
+
+def _run(adapter, on_progress=None, on_log=None, **kwargs):
+    return asyncio.run(adapter.execute(SleeptInput(dryrun=True, **kwargs), on_progress, on_log))
+
+
+def test_countdown_progress_and_completion(adapter):
+    """倒计时按秒报告剩余时间，结束时报告 100% 并模拟执行电源操作"""
+    progress, logs = [], []
+
+    result = _run(adapter, lambda p, m: progress.append((p, m)), logs.append, action="countdown", seconds=2)
+
+    assert result.success
+    assert result.timer_status == "completed"
+    assert result.remaining_seconds == 0
+    assert progress[0] == (0, "剩余 00:00:02")
+    assert (50, "剩余 00:00:01") in progress
+    assert progress[-1] == (100, "时间到！")
+    assert "🔔 [dryrun] 模拟执行: 休眠" in logs
+
+
+def test_countdown_rejects_zero_duration(adapter):
+    result = _run(adapter, action="countdown", seconds=0)
+
+    assert not result.success
+    assert result.message == "倒计时时间必须大于0"
+
+
+def test_cancel_stops_running_countdown(adapter):
+    """cancel 立即结束等待中的倒计时，并注销取消事件"""
+    async def scenario():
+        task = asyncio.create_task(adapter.execute(SleeptInput(action="countdown", seconds=30)))
+        await asyncio.sleep(0.2)
+        cancelled = await adapter.execute(SleeptInput(action="cancel"))
+        return cancelled, await task
+
+    cancel_result, result = asyncio.run(scenario())
+
+    assert cancel_result.message == "已取消 1 个定时任务"
+    assert not result.success
+    assert result.timer_status == "cancelled"
+    assert 28 <= result.remaining_seconds <= 30
+    assert not adapter._cancel_events
+    assert _run(adapter, action="cancel").timer_status == "idle"
+
+
+def test_cpu_monitor_triggers_below_threshold(adapter):
+    """CPU 持续低于阈值达到时长后触发，中途回升会重新计时"""
+    _fake_psutil(adapter, [5.0, 80.0, 5.0])
+    logs = []
+
+    result = _run(adapter, on_log=logs.append, action="cpu", cpu_threshold=50, cpu_duration=0.005)
+
+    assert result.success
+    assert result.timer_status == "completed"
+    assert result.current_cpu == 5.0
+    assert result.message == "[dryrun] CPU监控触发，模拟执行 sleep"
+    assert logs.count("📉 CPU 5.0% 低于阈值，开始计时...") == 2
+    assert "📈 CPU使用率恢复 (80.0%)" in logs
+    assert "⏰ CPU低使用率已持续 0.005 分钟" in logs
+
+
+@pytest.mark.parametrize("mode, sent_step, recv_step", [
+    ("both", 10, 10),
+    # any 模式下只要一个方向低于阈值即可
+    ("any", 10 * 1024 * 1024, 10),
+])
+def test_netspeed_monitor_triggers_below_threshold(adapter, mode, sent_step, recv_step):
+    """网速低于阈值达到时长后触发，并返回最后一次的采样值"""
+    _fake_psutil(adapter, [3.0], sent_step=sent_step, recv_step=recv_step)
+    progress, logs = [], []
+
+    result = _run(
+        adapter, lambda p, m: progress.append((p, m)), logs.append,
+        action="netspeed", upload_threshold=100, download_threshold=100,
+        net_duration=0.005, net_trigger_mode=mode,
+    )
+
+    assert result.success
+    assert result.timer_status == "completed"
+    assert result.message == "[dryrun] 网速监控触发，模拟执行 sleep"
+    assert result.current_cpu == 3.0
+    assert result.current_download < 100
+    assert progress[-1] == (100, "触发条件达成！")
+    assert "⏰ 网速低于阈值已持续 0.005 分钟" in logs
+
+
+def test_netspeed_monitor_busy_both_does_not_trigger(adapter, monkeypatch):
+    """both 模式下上传繁忙时不触发，超出最长等待后返回超时"""
+    monkeypatch.setattr(SleeptAdapter, "MAX_MONITOR_SECONDS", 1.3)
+    _fake_psutil(adapter, [3.0], sent_step=10 * 1024 * 1024, recv_step=10)
+    progress = []
+
+    result = _run(
+        adapter, lambda p, m: progress.append((p, m)),
+        action="netspeed", upload_threshold=100, download_threshold=100,
+        net_duration=0.005, net_trigger_mode="both",
+    )
+
+    assert not result.success
+    assert result.message == "监控超时（1小时），未触发条件"
+    # 采样多次，但高于阈值期间"监控中"按间隔限流，只报告首次
+    assert len(progress) == 1
+    assert progress[0][1].startswith("监控中 ↑")